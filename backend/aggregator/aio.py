@@ -0,0 +1,79 @@
+import asyncio, importlib.util, os, threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional
+import httpx
+
+from . import trace
+
+# One event loop on its own thread owns the app-lifetime AsyncClient (keep-alive pool,
+# HTTP/2 when `h2` is installed). Feeds, article pages, Gemini and the Gita API all
+# go through it: worker threads block on a future, async handlers await it, and
+# the sockets themselves are multiplexed on this loop instead of one thread each.
+HTTP2 = importlib.util.find_spec("h2") is not None
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_THREAD: Optional[threading.Thread] = None
+_CLIENT: Optional[httpx.AsyncClient] = None
+_LOCK = threading.Lock()
+
+def _make_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=HTTP2,
+        follow_redirects=True,
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS),
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS // 2),
+    )
+
+def _ensure() -> asyncio.AbstractEventLoop:
+    global _LOOP, _THREAD, _CLIENT
+    with _LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            t = threading.Thread(target=loop.run_forever, name="aio", daemon=True)
+            t.start()
+            _CLIENT = _make_client()
+            _LOOP, _THREAD = loop, t
+        return _LOOP
+
+def start():
+    """Open the loop + client up front (app startup); otherwise the first call does it."""
+    _ensure()
+
+def stop():
+    """Close the client and stop the loop (app shutdown)."""
+    global _LOOP, _THREAD, _CLIENT
+    with _LOCK:
+        loop, t, c = _LOOP, _THREAD, _CLIENT
+        _LOOP = _THREAD = _CLIENT = None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(c.aclose(), loop).result(5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    t.join(5)
+
+def client() -> httpx.AsyncClient:
+    """The shared client; only use it inside coroutines running on the I/O loop (submit/run/call)."""
+    _ensure()
+    return _CLIENT
+
+def submit(coro: Awaitable) -> Future:
+    """Schedule `coro` on the I/O loop (inside the caller's request trace); returns a concurrent.futures.Future."""
+    t = trace.current()
+    if t is not None:
+        coro = trace.within(t, coro)
+    return asyncio.run_coroutine_threadsafe(coro, _ensure())
+
+def run(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Blocking call from sync code (never from the I/O loop itself)."""
+    if threading.current_thread() is _THREAD:
+        raise RuntimeError("aio.run() called on the I/O loop")
+    return submit(coro).result(timeout)
+
+async def call(coro: Awaitable) -> Any:
+    """Await `coro` on the I/O loop from another event loop (e.g. an async route handler)."""
+    return await asyncio.wrap_future(submit(coro))
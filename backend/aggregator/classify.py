@@ -1,51 +1,70 @@
-import re
-from typing import Dict, List, Optional
-from .config import POS_WORDS, NEG_WORDS, RULING_PARTY_BY_STATE
-
-# Generic governance anchors – neutral and widely-used tokens
-GOV_TERMS_GENERIC = [
-    r"\bgovernment\b", r"\bgovt\b", r"\bstate government\b", r"\badministration\b",
-    r"\bchief minister\b", r"\bcm\b", r"\bcabinet\b", r"\bsecretariat\b",
-    r"\bministry\b", r"\bdepartment\b"
-]
-
-def _window_hits(text: str, center_terms: List[str], cue_words: List[str], win: int = 70) -> int:
-    """Count cue words within ±win chars of any governance term."""
-    t = text.lower()
-    idxs: List[int] = []
-    for c in center_terms:
-        for m in re.finditer(c, t):
-            idxs.append(m.start())
-    hits = 0
-    for pos in idxs:
-        left = max(0, pos - win)
-        right = min(len(t), pos + win)
-        window = t[left:right]
-        for w in cue_words:
-            if w in window:
-                hits += 1
-    return hits
-
-def stance_for_state_politics(text: str, state: Optional[str]) -> Dict:
-    """
-    Lightweight, explainable stance around governance mentions.
-    Not party-specific; returns a soft 'governance tone' near generic gov anchors.
-    """
-    ruling = RULING_PARTY_BY_STATE.get(state or "", None)
-    if not ruling:
-        return {"label": "neutral", "confidence": 0.45}
-
-    tl = text.lower()
-    gov_pos = _window_hits(tl, GOV_TERMS_GENERIC, POS_WORDS)
-    gov_neg = _window_hits(tl, GOV_TERMS_GENERIC, NEG_WORDS)
-
-    score = 2 * (gov_pos - gov_neg)
-    if score >= 2:
-        return {"label": "positive", "confidence": 0.7}
-    if score <= -2:
-        return {"label": "negative", "confidence": 0.7}
-    if (gov_pos - gov_neg) == 1:
-        return {"label": "positive", "confidence": 0.55}
-    if (gov_neg - gov_pos) == 1:
-        return {"label": "negative", "confidence": 0.55}
-    return {"label": "neutral", "confidence": 0.5}
+import re
+from typing import Dict, List, Optional
+from .config import CATEGORY_KEYWORDS, POS_WORDS, NEG_WORDS, RULING_PARTY_BY_STATE
+
+# Generic governance anchors – neutral and widely-used tokens
+GOV_TERMS_GENERIC = [
+    r"\bgovernment\b", r"\bgovt\b", r"\bstate government\b", r"\badministration\b",
+    r"\bchief minister\b", r"\bcm\b", r"\bcabinet\b", r"\bsecretariat\b",
+    r"\bministry\b", r"\bdepartment\b"
+]
+
+# All anchors in one scan: the zero-width lookahead reports every start position,
+# including anchors nested in another ("government" inside "state government").
+_GOV_RE = re.compile("(?=(?:" + "|".join(GOV_TERMS_GENERIC) + "))")
+
+# keyword -> categories, deduplicated ("results" is both education and business)
+_KEYWORD_CATEGORIES: Dict[str, List[str]] = {}
+for _cat, _keys in CATEGORY_KEYWORDS.items():
+    for _k in _keys:
+        _KEYWORD_CATEGORIES.setdefault(_k, []).append(_cat)
+
+def category_scores(text: str) -> Dict[str, int]:
+    """category -> number of its keywords present in text (substring match, like text_contains_any)."""
+    t = (text or "").lower()
+    out: Dict[str, int] = {}
+    for k, cats in _KEYWORD_CATEGORIES.items():
+        if k in t:
+            for c in cats:
+                out[c] = out.get(c, 0) + 1
+    return out
+
+def _gov_positions(t: str) -> List[int]:
+    return [m.start() for m in _GOV_RE.finditer(t)]
+
+def _window_hits(t: str, idxs: List[int], cue_words: List[str], win: int = 70) -> int:
+    """Count cue words within ±win chars of each governance anchor position (t already lowercased)."""
+    hits = 0
+    for pos in idxs:
+        left = max(0, pos - win)
+        right = min(len(t), pos + win)
+        window = t[left:right]
+        for w in cue_words:
+            if w in window:
+                hits += 1
+    return hits
+
+def stance_for_state_politics(text: str, state: Optional[str]) -> Dict:
+    """
+    Lightweight, explainable stance around governance mentions.
+    Not party-specific; returns a soft 'governance tone' near generic gov anchors.
+    """
+    ruling = RULING_PARTY_BY_STATE.get(state or "", None)
+    if not ruling:
+        return {"label": "neutral", "confidence": 0.45}
+
+    tl = text.lower()
+    idxs = _gov_positions(tl)  # shared by both lexicons
+    gov_pos = _window_hits(tl, idxs, POS_WORDS)
+    gov_neg = _window_hits(tl, idxs, NEG_WORDS)
+
+    score = 2 * (gov_pos - gov_neg)
+    if score >= 2:
+        return {"label": "positive", "confidence": 0.7}
+    if score <= -2:
+        return {"label": "negative", "confidence": 0.7}
+    if (gov_pos - gov_neg) == 1:
+        return {"label": "positive", "confidence": 0.55}
+    if (gov_neg - gov_pos) == 1:
+        return {"label": "negative", "confidence": 0.55}
+    return {"label": "neutral", "confidence": 0.5}
@@ -0,0 +1,161 @@
+import os, random, re, threading, zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+# Near-duplicate story clustering (same wire story from several publishers).
+# MinHash signatures over word shingles of title + description, banded for LSH:
+# only items sharing a band bucket are compared, so clustering stays ~linear.
+# Clustering a store key again (every refresh) reuses what the last run learned:
+# signatures of unchanged records and the merges found between them. Only new or
+# changed records, plus the members of a cluster that lost or changed one, are compared.
+CLUSTER_ENABLED = os.getenv("CLUSTER_ENABLED", "1") == "1"
+CLUSTER_THRESHOLD = float(os.getenv("CLUSTER_THRESHOLD", "0.5"))  # shingle Jaccard to merge
+NUM_PERM = 32
+CANDIDATE_RECALL = 0.98  # chance that a pair right at the threshold shares a band
+
+def _banding(threshold: float, num_perm: int, recall: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with the most rows per band (fewest spurious candidates) whose LSH
+    S-curve 1 - (1 - J^rows)^bands still reaches `recall` at J = threshold; the exact
+    Jaccard check then removes the extra candidates below the threshold.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if num_perm % rows == 0 and 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return num_perm, 1
+
+BANDS, ROWS = _banding(CLUSTER_THRESHOLD, NUM_PERM, CANDIDATE_RECALL)  # 0.5 -> 16 bands x 2 rows
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# independent hash functions h_i(x) = (a_i * x + b_i) mod p over each shingle's crc32
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1701)
+_COEFFS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+def _shingles(text: str) -> set:
+    toks = _TOKEN_RE.findall((text or "").lower())
+    if len(toks) < 3:
+        return set(toks)
+    return {toks[i] + " " + toks[i + 1] for i in range(len(toks) - 1)}
+
+def signature(shingles: set) -> List[int]:
+    hashes = [zlib.crc32(s.encode()) for s in shingles]
+    if not hashes:
+        return []
+    return [min([(a * h + b) % _PRIME for h in hashes]) for a, b in _COEFFS]
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)  # no union set: |a ∪ b| = |a| + |b| - |a ∩ b|
+    return inter / (len(a) + len(b) - inter)
+
+class _State:
+    """What clustering one store key learned last time."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.docs: Dict[str, Tuple[str, set, List[int]]] = {}  # url -> (text, shingles, signature)
+        self.edges: Dict[str, Set[str]] = {}                   # url -> urls it was merged with
+        self.comp: Dict[str, int] = {}                         # url -> its cluster at the last run
+
+_STATES: Dict[str, _State] = {}
+_STATES_LOCK = threading.Lock()
+
+def _state(key: Optional[str]) -> _State:
+    if key is None:
+        return _State()
+    with _STATES_LOCK:
+        return _STATES.setdefault(key, _State())
+
+def cluster_records(records: List[Dict], key: Optional[str] = None) -> List[Dict]:
+    """
+    Collapse near-duplicates into one representative per story, keeping input order.
+    The representative is the member with the longest description; it comes back as a
+    copy with a "sources" list ({"source", "url"}) covering every member, itself first
+    (input records are never modified). With `key` (a store key) the work of the last
+    call for that key is reused; the result is the same as clustering from scratch.
+    """
+    if not CLUSTER_ENABLED or len(records) < 2:
+        return records
+    urls = [r["item"]["url"] for r in records]
+    st = _state(key if len(set(urls)) == len(urls) else None)
+    with st.lock:
+        return _cluster(records, urls, st)
+
+def _cluster(records: List[Dict], urls: List[str], st: _State) -> List[Dict]:
+    texts = dict(zip(urls, (f"{r['title']} {r['desc']}" for r in records)))
+    changed = {u for u, d in st.docs.items() if texts.get(u) != d[0]}  # gone or edited
+    broken = {st.comp[u] for u in changed if u in st.comp}
+    dirty = {u for u in urls if u not in st.docs or u in changed or st.comp.get(u) in broken}
+    for u in changed:
+        del st.docs[u]
+    for u in urls:
+        if u not in st.docs:
+            sh = _shingles(texts[u])
+            st.docs[u] = (texts[u], sh, signature(sh))
+
+    idx = {u: i for i, u in enumerate(urls)}
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges: Dict[str, Set[str]] = {}
+    for u in urls:
+        if u not in dirty:
+            edges[u] = {v for v in st.edges.get(u, ()) if v in idx and v not in dirty}
+            for v in edges[u]:
+                parent[find(idx[u])] = find(idx[v])
+
+    # clean records go into the buckets first without comparing (their pairs were settled
+    # last time); each dirty one is then compared with everything already bucketed
+    buckets: Dict[tuple, List[int]] = {}
+    order = [i for i, u in enumerate(urls) if u not in dirty] + [i for i, u in enumerate(urls) if u in dirty]
+    for i in order:
+        _, sh_i, sig = st.docs[urls[i]]
+        if not sig:
+            continue
+        compare = urls[i] in dirty
+        checked = set()
+        n_i = len(sh_i)
+        for b in range(BANDS):
+            band = (b, tuple(sig[b * ROWS:(b + 1) * ROWS]))
+            for j in buckets.get(band, ()) if compare else ():
+                if j in checked:
+                    continue
+                checked.add(j)
+                sh_j = st.docs[urls[j]][1]
+                n_j = len(sh_j)
+                if min(n_i, n_j) < CLUSTER_THRESHOLD * max(n_i, n_j):
+                    continue  # Jaccard can't reach the threshold
+                ri, rj = find(i), find(j)
+                if ri != rj and _jaccard(sh_i, sh_j) >= CLUSTER_THRESHOLD:
+                    parent[ri] = rj
+                    edges.setdefault(urls[i], set()).add(urls[j])
+                    edges.setdefault(urls[j], set()).add(urls[i])
+            buckets.setdefault(band, []).append(i)
+    st.edges = edges
+    st.comp = {u: find(i) for i, u in enumerate(urls)}
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(records)):
+        groups.setdefault(find(i), []).append(i)
+
+    out: List[Dict] = []
+    for i, rec in enumerate(records):
+        members = groups[find(i)]
+        if len(members) == 1:
+            out.append(rec)
+            continue
+        rep = max(members, key=lambda m: (len(records[m]["desc"]), -m))
+        if i != rep:
+            continue
+        others = [records[m]["item"] for m in members if m != rep]
+        sources = [{"source": rec["item"]["source"], "url": rec["item"]["url"]}] + [
+            {"source": o["source"], "url": o["url"]} for o in others
+        ]
+        out.append(dict(rec, item=dict(rec["item"], sources=sources)))
+    return out
@@ -0,0 +1,86 @@
+import datetime as dt
+from typing import Dict, List, Optional
+
+from .sources import CURATED_FEEDS
+from .feeds import fetch_feeds, newest_first
+from .cluster import cluster_records
+from .metrics import STAGE_SECONDS, timed
+from .store import STORE_DAYS, STORE_MAX_ITEMS, get_records, register, store_key
+from .utils import strip_html
+from .summarize import summarize_batch
+from . import persist
+
+def _parse_pub(entry) -> Optional[dt.datetime]:
+    t = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
+    if not t: return None
+    try:
+        return dt.datetime(*t[:6], tzinfo=dt.timezone.utc)
+    except Exception:
+        return None
+
+def _load_curated(topic: str, max_per_feed: int = 120) -> List[Dict]:
+    """Fetch + summarize the newest entries of a curated topic inside the store window."""
+    urls = CURATED_FEEDS.get(topic, [])
+    records: List[Dict] = []
+    seen = set()
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=STORE_DAYS)
+    with timed(STAGE_SECONDS, stage="fetch"):
+        parsed = fetch_feeds(urls)
+    # newest first across feeds: past the cutoff only undated entries remain
+    for pub, feed, e in newest_first(parsed, urls, _parse_pub, max_per_feed):
+        if len(records) >= STORE_MAX_ITEMS:
+            break
+        if pub and pub < cutoff:
+            continue
+        try:
+            link = (e.get("link") or "").strip()
+            title = (e.get("title") or "").strip()
+            if not link or not title: continue
+            norm = link.split("?",1)[0].rstrip("/")
+            if norm in seen: continue
+            src = ""
+            try: src = feed.feed.get("title","")
+            except: pass
+            desc = strip_html(e.get("summary") or e.get("description") or "")
+            records.append({
+                "item": {
+                    "title": title,
+                    "url": norm,
+                    "published_at": pub.isoformat() if pub else None,
+                    "summary": "",
+                    "source": src,
+                    "category": topic
+                },
+                "pub": pub,
+                "title": title,
+                "desc": desc,
+                "text": desc,
+            })
+            seen.add(norm)
+        except Exception:
+            continue
+    with timed(STAGE_SECONDS, stage="cluster"):
+        records = cluster_records(records, key=store_key("curated", topic))
+    pending = [(r["item"]["url"], r["title"], r["desc"]) for r in records]
+    with timed(STAGE_SECONDS, stage="summarize"):
+        summaries = persist.cached_summaries(
+            pending, 900, lambda docs: [s or text[:900] for (_, text), s in zip(docs, summarize_batch(docs, 900))]
+        )
+    for rec, summary in zip(records, summaries):
+        rec["item"]["summary"] = summary
+    return records
+
+def get_curated(topic: str, days: int, limit: int) -> List[Dict]:
+    """Curated topic items from the store: rolling `days` window (undated entries kept), newest first."""
+    records = get_records(store_key("curated", topic))
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=days)
+    out: List[Dict] = []
+    for rec in records:
+        if rec["pub"] and rec["pub"] < cutoff:
+            continue
+        out.append(dict(rec["item"]))
+        if len(out) >= limit: break
+    return out
+
+for _topic in CURATED_FEEDS:
+    register(store_key("curated", _topic), lambda t=_topic: _load_curated(t), pinned=True)
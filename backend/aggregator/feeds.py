@@ -0,0 +1,246 @@
+import asyncio, datetime as dt, heapq, os, time, threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import feedparser, httpx
+
+from . import aio, metrics, rss, trace
+from .store import STORE_DAYS
+
+USER_AGENT = os.getenv("NL_USER_AGENT", "Mozilla/5.0 NewsLens/1.2 (+https://example.invalid)")
+FEED_WORKERS = int(os.getenv("FEED_WORKERS", "8"))
+FEED_TIMEOUT_SECONDS = float(os.getenv("FEED_TIMEOUT_SECONDS", "6"))      # per feed, whole download
+FEED_DEADLINE_SECONDS = float(os.getenv("FEED_DEADLINE_SECONDS", "10"))   # per request, all feeds
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "3"))              # consecutive failures to open
+BREAKER_COOLOFF_SECONDS = float(os.getenv("BREAKER_COOLOFF_SECONDS", "300"))
+FEED_MAX_BYTES = int(os.getenv("FEED_MAX_BYTES", str(4 * 1024 * 1024)))  # download cap; the parse keeps what fit
+FEED_MAX_ENTRIES = int(os.getenv("FEED_MAX_ENTRIES", "120"))             # >= every caller's max_per_feed
+FEED_STREAM_PARSE = os.getenv("FEED_STREAM_PARSE", "1") == "1"           # 0 = always full feedparser
+PARSE_CHUNK_BYTES = 64 * 1024  # streaming parse granularity (one pool hop each)
+
+# Downloads run on the shared async client (aio); parsing runs on a bounded pool
+_POOL = ThreadPoolExecutor(max_workers=FEED_WORKERS, thread_name_prefix="feed")
+_INFLIGHT: Dict[str, "asyncio.Task"] = {}  # url -> running fetch; only touched on the I/O loop
+
+# Per-feed circuit breaker: {url: {"fails": int, "open_until": monotonic ts, "probe_until": monotonic ts,
+# "lat": ewma seconds}}. Half-open once the cool-off is over: one probe at a time until it resolves.
+_BREAKER: Dict[str, Dict] = {}
+_BREAKER_LOCK = threading.Lock()
+
+def _breaker_allows(url: str) -> bool:
+    with _BREAKER_LOCK:
+        b = _BREAKER.get(url)
+        if not b or b["fails"] < BREAKER_THRESHOLD:
+            return True  # closed
+        now = time.monotonic()
+        if b["open_until"] > now or b["probe_until"] > now:
+            return False  # open, or half-open with a probe already out
+        b["probe_until"] = now + FEED_TIMEOUT_SECONDS + 1  # this caller probes (lapses if it never reports)
+        return True
+
+def _breaker_record(url: str, ok: bool, elapsed: float):
+    with _BREAKER_LOCK:
+        b = _BREAKER.setdefault(url, {"fails": 0, "open_until": 0.0, "probe_until": 0.0, "lat": elapsed})
+        b["lat"] = 0.7 * b["lat"] + 0.3 * elapsed
+        b["probe_until"] = 0.0
+        if ok:
+            b["fails"], b["open_until"] = 0, 0.0
+            return
+        b["fails"] += 1
+        if b["fails"] >= BREAKER_THRESHOLD:
+            # back off longer while the publisher keeps failing (capped at 4x)
+            mult = min(4, b["fails"] - BREAKER_THRESHOLD + 1)
+            b["open_until"] = time.monotonic() + BREAKER_COOLOFF_SECONDS * mult
+
+# Conditional-GET validators + last parsed feed: {url: {"etag", "modified", "feed"}}
+_VALIDATORS: Dict[str, Dict] = {}
+
+def _expected_latency(url: str) -> float:
+    b = _BREAKER.get(url)
+    return b["lat"] if b else 0.0
+
+def breaker_state() -> Dict[str, Dict]:
+    """Snapshot of breaker state (for debugging/metrics)."""
+    now = time.monotonic()
+    with _BREAKER_LOCK:
+        return {
+            u: {"fails": b["fails"], "open": b["open_until"] > now, "probing": b["probe_until"] > now,
+                "latency": round(b["lat"], 3)}
+            for u, b in _BREAKER.items()
+        }
+
+metrics.collector(lambda: [(
+    "newslens_feed_breaker_open", "gauge", "1 while the feed's circuit breaker is open",
+    {(("feed", u),): float(b["open"]) for u, b in breaker_state().items()},
+)])
+
+def _parse_step(sp: rss.StreamParser, data: bytes, final: bool):
+    """One pool hop of the streaming parse: the finished feed once it has enough (or the body ended), else None."""
+    with trace.span("feed_parse"):
+        more = sp.push(data) if data else True
+        return sp.close() if final or not more else None
+
+async def _download(url: str, validators: Optional[Dict] = None) -> Tuple[int, bytes, Dict[str, str], Optional[object]]:
+    """
+    Stream the body (the caller caps the whole download at FEED_TIMEOUT_SECONDS), at most
+    FEED_MAX_BYTES of it. Each PARSE_CHUNK_BYTES of it goes to the streaming parser on the
+    pool while the rest is still arriving, and the response is closed as soon as the parser
+    has FEED_MAX_ENTRIES entries or reached the store window. The raw bytes are kept only
+    so feedparser can take over when the streaming parser gives up (feed is then None).
+    Sends If-None-Match / If-Modified-Since when we hold validators; a 304 comes back with an empty body.
+    """
+    req_headers = {"User-Agent": USER_AGENT}
+    if validators:
+        if validators.get("etag"):
+            req_headers["If-None-Match"] = validators["etag"]
+        if validators.get("modified"):
+            req_headers["If-Modified-Since"] = validators["modified"]
+    async with aio.client().stream("GET", url, headers=req_headers, timeout=FEED_TIMEOUT_SECONDS) as r:
+        if r.status_code == 304:
+            return 304, b"", dict(r.headers), None
+        r.raise_for_status()
+        headers = dict(r.headers)
+        headers["content-location"] = str(r.url)  # lets feedparser resolve relative links
+        cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=STORE_DAYS)
+        sp = rss.StreamParser(str(r.url), FEED_MAX_ENTRIES, cutoff) if FEED_STREAM_PARSE else None
+        loop = asyncio.get_running_loop()
+        parse_s = 0.0
+
+        async def step(data: bytes, final: bool):
+            nonlocal sp, parse_s
+            t0 = time.monotonic()
+            try:
+                return await loop.run_in_executor(_POOL, trace.wrap(lambda: _parse_step(sp, data, final)))
+            except rss.Unsupported:
+                metrics.FEED_PARSE_FALLBACK.inc(feed=url)
+                sp = None  # keep downloading; feedparser gets the whole body
+            finally:
+                parse_s += time.monotonic() - t0
+
+        chunks, pending, size, feed = [], [], 0, None
+        async for chunk in r.aiter_bytes():
+            if size + len(chunk) > FEED_MAX_BYTES:
+                chunk = chunk[:FEED_MAX_BYTES - size]
+                metrics.FEED_ERRORS.inc(feed=url, error="truncated")
+            chunks.append(chunk)
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= FEED_MAX_BYTES:
+                break
+            if sp is not None and sum(map(len, pending)) >= PARSE_CHUNK_BYTES:
+                feed = await step(b"".join(pending), False)
+                pending = []
+                if feed is not None:
+                    break  # enough entries: don't download (or tokenize) the rest
+        if sp is not None and feed is None:
+            feed = await step(b"".join(pending), True)
+        if parse_s:
+            metrics.FEED_PARSE_SECONDS.observe(parse_s, feed=url)
+        return r.status_code, b"".join(chunks), headers, feed
+
+def _parse(body: bytes, headers: Dict[str, str]):
+    with trace.span("feed_parse"):
+        return feedparser.parse(body, response_headers=headers)
+
+def _error_kind(e: Exception) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"http_{e.response.status_code}"
+    if isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    return type(e).__name__
+
+async def _fetch_feed(url: str):
+    """Download one feed over the shared client and parse it off-loop; None on any failure."""
+    t0 = time.monotonic()
+    cached = _VALIDATORS.get(url)
+    try:
+        # a publisher that trickles bytes can't outlive FEED_TIMEOUT_SECONDS
+        with trace.span("feed_download"):
+            status, body, headers, feed = await asyncio.wait_for(_download(url, cached), FEED_TIMEOUT_SECONDS)
+        metrics.FEED_FETCH_SECONDS.observe(time.monotonic() - t0, feed=url)
+        if status == 304 and cached:
+            metrics.FEED_NOT_MODIFIED.inc(feed=url)
+            feed = cached["feed"]  # unchanged upstream → reuse entries, skip the XML parse
+        else:
+            metrics.FEED_BYTES.inc(len(body), feed=url)
+            if feed is None:  # streaming parse off or gave up
+                t1 = time.monotonic()
+                feed = await asyncio.get_running_loop().run_in_executor(_POOL, trace.wrap(lambda: _parse(body, headers)))
+                metrics.FEED_PARSE_SECONDS.observe(time.monotonic() - t1, feed=url)
+            if feed.get("bozo") and not feed.entries:  # an error page or broken XML: not a working feed
+                metrics.FEED_ERRORS.inc(feed=url, error="unparseable")
+                _VALIDATORS.pop(url, None)
+                _breaker_record(url, False, time.monotonic() - t0)
+                return None
+            if headers.get("etag") or headers.get("last-modified"):
+                _VALIDATORS[url] = {
+                    "etag": headers.get("etag"),
+                    "modified": headers.get("last-modified"),
+                    "feed": feed,
+                }
+            else:
+                _VALIDATORS.pop(url, None)
+        metrics.FEED_ENTRIES.set(len(feed.entries), feed=url)
+    except Exception as e:
+        metrics.FEED_ERRORS.inc(feed=url, error=_error_kind(e))
+        _breaker_record(url, False, time.monotonic() - t0)
+        return None
+    _breaker_record(url, True, time.monotonic() - t0)
+    return feed
+
+async def _fetch_coalesced(url: str):
+    """Overlapping requests for the same feed share one download."""
+    task = _INFLIGHT.get(url)
+    if task is None:
+        task = _INFLIGHT[url] = asyncio.ensure_future(_fetch_feed(url))
+        task.add_done_callback(lambda _t: _INFLIGHT.pop(url, None))
+    return await asyncio.shield(task)
+
+def _submit(urls: List[str]) -> Dict[str, object]:
+    uniq = [u for u in dict.fromkeys(urls) if _breaker_allows(u)]
+    uniq.sort(key=_expected_latency)  # historically fast feeds first when the connection pool is busy
+    return {u: aio.submit(_fetch_coalesced(u)) for u in uniq}
+
+def fetch_feeds(urls: List[str], deadline: Optional[float] = None) -> Dict[str, Optional[object]]:
+    """
+    Download all feeds concurrently on the shared async client, parse on the bounded pool.
+    Returns {url: parsed_feed_or_None}; wall time ≈ slowest feed, not the sum.
+    Feeds with an open breaker are skipped; whatever hasn't finished by the
+    request deadline is reported as None (it keeps running and still updates the breaker).
+    """
+    deadline = FEED_DEADLINE_SECONDS if deadline is None else deadline
+    futures = _submit(urls)
+    wait(futures.values(), timeout=deadline)
+    return {u: (f.result() if f.done() else None) for u, f in futures.items()}
+
+def iter_feeds(urls: List[str], deadline: Optional[float] = None) -> Iterator[Tuple[str, Optional[object]]]:
+    """fetch_feeds, as (url, parsed_feed_or_None) in completion order; stops at the deadline."""
+    deadline = FEED_DEADLINE_SECONDS if deadline is None else deadline
+    futures = _submit(urls)
+    by_future = {f: u for u, f in futures.items()}
+    try:
+        for f in as_completed(by_future, timeout=deadline):
+            yield by_future[f], f.result()
+    except FuturesTimeout:
+        pass
+
+def newest_first(parsed: Dict[str, Optional[object]], urls: List[str], pub_of: Callable,
+                 max_per_feed: int) -> Iterator[Tuple[object, object, object]]:
+    """
+    Entries of every parsed feed as one stream of (pub, feed, entry), newest first.
+    Each feed is sorted by its own publish dates, then the feeds are heap-merged, so a
+    consumer can stop as soon as it has enough (or hits its date cutoff) without ever
+    touching the older tail. Undated entries follow the dated ones, in feed order.
+    """
+    streams, undated = [], []
+    for url in urls:
+        feed = parsed.get(url)
+        if feed is None:
+            continue
+        dated = []
+        for e in getattr(feed, "entries", [])[:max_per_feed]:
+            pub = pub_of(e)
+            (dated if pub else undated).append((pub, feed, e))
+        dated.sort(key=lambda x: x[0], reverse=True)
+        streams.append(dated)
+    yield from heapq.merge(*streams, key=lambda x: x[0], reverse=True)
+    yield from undated
@@ -1,188 +1,480 @@
-import datetime as dt
-from typing import List, Optional, Dict
-import pytz, feedparser, re, time, os
-
-from .sources import NATIONAL_FEEDS, STATE_FEEDS
-from .config import CATEGORY_KEYWORDS
-from .classify import stance_for_state_politics
-from .utils import within_days_ist, text_contains_any, summary_from_text, strip_html
-from .summarize import summarize_rule_based
-
-IST = pytz.timezone("Asia/Kolkata")
-
-# In-memory cache (works fine for single dyno)
-_CACHE: Dict[str, Dict] = {}
-_CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(15 * 60)))  # default 15 min
-
-USER_AGENT = os.getenv("NL_USER_AGENT", "Mozilla/5.0 NewsLens/1.2 (+https://example.invalid)")
-DEEP_MODE_ENABLED = os.getenv("DEEP_MODE_ENABLED", "1") == "1"  # allow disabling newspaper3k entirely on free hosts
-
-def _cache_key(scope: str, state: Optional[str], category: Optional[str], days: int, limit: int, fetch_mode: str) -> str:
-    return f"{scope}|{state or ''}|{category or ''}|{days}|{limit}|{fetch_mode}"
-
-def _get_cached(key: str) -> Optional[List[Dict]]:
-    it = _CACHE.get(key)
-    if not it:
-        return None
-    if (dt.datetime.utcnow() - it["ts"]).total_seconds() > _CACHE_TTL_SECONDS:
-        _CACHE.pop(key, None)
-        return None
-    return it["value"]
-
-def _set_cached(key: str, value: List[Dict]):
-    _CACHE[key] = {"ts": dt.datetime.utcnow(), "value": value[:]}
-
-def _parse_pub_date(entry) -> Optional[dt.datetime]:
-    tstruct = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
-    if not tstruct:
-        return None
-    try:
-        return dt.datetime(*tstruct[:6], tzinfo=pytz.UTC).astimezone(IST)
-    except Exception:
-        return None
-
-def _download_article(url: str, retries: int = 1) -> Dict:
-    """
-    Lazy-import newspaper3k to avoid startup import failures on Render (lxml_html_clean).
-    If import fails or DEEP_MODE_ENABLED=0, return empty text -> caller will fall back.
-    """
-    if not DEEP_MODE_ENABLED:
-        return {"title": "", "text": "", "published_at": None, "err": "deep_mode_disabled"}
-
-    try:
-        from newspaper import Article, Config  # lazy import
-    except Exception as e:
-        return {"title": "", "text": "", "published_at": None, "err": f"newspaper_import_failed:{e.__class__.__name__}"}
-
-    cfg = Config()
-    cfg.browser_user_agent = USER_AGENT
-    cfg.request_timeout = 12
-    cfg.memoize_articles = False
-    cfg.fetch_images = False
-
-    last_err = None
-    for _ in range(retries + 1):
-        try:
-            art = Article(url, config=cfg)
-            art.download()
-            art.parse()
-            text = (art.text or "").strip()
-            title = (art.title or "").strip()
-            pub = None
-            try:
-                if art.publish_date:
-                    pub = art.publish_date.astimezone(IST).isoformat()
-            except Exception:
-                pub = None
-            return {"title": title, "text": text, "published_at": pub}
-        except Exception as e:
-            last_err = e
-            time.sleep(0.4)
-    return {"title": "", "text": "", "published_at": None, "err": f"download_failed:{type(last_err).__name__ if last_err else 'unknown'}"}
-
-def _match_category(title: str, desc: str, fulltext: str, cat: Optional[str]) -> bool:
-    if not cat:
-        return True
-    keys = CATEGORY_KEYWORDS.get(cat, [])
-    blob = " ".join([title or "", desc or "", fulltext or ""])
-    return text_contains_any(blob, keys)
-
-def _collect_feeds(scope: str, state: Optional[str]) -> List[str]:
-    if scope == "national":
-        return NATIONAL_FEEDS
-    if scope == "state":
-        return STATE_FEEDS.get(state or "", []) or []
-    return []
-
-def get_news(
-    scope: str,
-    state: Optional[str],
-    category: Optional[str],
-    days: int,
-    limit: int,
-    fetch_mode: str = "light",
-    max_per_feed: int = 80
-) -> List[Dict]:
-    """Fetch + summarize from RSS with defensive parsing and caching."""
-    days = max(1, min(14, int(days)))
-    limit = max(1, min(200, int(limit)))
-    fetch_mode = "deep" if (fetch_mode == "deep" and DEEP_MODE_ENABLED) else "light"
-
-    key = _cache_key(scope, state, category, days, limit, fetch_mode)
-    cached = _get_cached(key)
-    if cached is not None:
-        return cached
-
-    feeds = _collect_feeds(scope, state)
-    results: List[Dict] = []
-    seen = set()
-
-    for feed_url in feeds:
-        try:
-            feed = feedparser.parse(feed_url)
-            entries = getattr(feed, "entries", [])[:max_per_feed]
-            for entry in entries:
-                pub_dt = _parse_pub_date(entry)
-                if not within_days_ist(pub_dt, days):
-                    continue
-
-                link = (entry.get("link") or "").strip()
-                if not link:
-                    continue
-                norm = link.split("?", 1)[0].rstrip("/")
-                if norm in seen:
-                    continue
-
-                title = (entry.get("title") or "").strip()
-                desc = strip_html(entry.get("description") or "")
-                source_title = ""
-                try:
-                    source_title = feed.feed.get("title", "")
-                except Exception:
-                    pass
-
-                art_title, art_text, art_pub = title, "", None
-                if fetch_mode == "deep":
-                    a = _download_article(norm, retries=1)
-                    art_title = a.get("title") or art_title
-                    art_text = a.get("text") or ""  # may be empty if import failed
-                    art_pub = a.get("published_at")
-                    if not art_text:
-                        art_text = desc
-                else:
-                    art_text = desc
-
-                if not _match_category(art_title, desc, art_text, category):
-                    continue
-
-                summary = summarize_rule_based(art_title, art_text, max_chars=900) or summary_from_text(art_text or desc, art_title, 900)
-
-                item = {
-                    "title": art_title or title or "(untitled)",
-                    "url": norm,
-                    "published_at": art_pub or (pub_dt.isoformat() if pub_dt else None),
-                    "summary": summary,
-                    "source": source_title,
-                    "state": state if scope == "state" else None,
-                    "category": category or "all",
-                }
-
-                if (category == "politics") and (scope == "state") and state:
-                    stance = stance_for_state_politics((art_title or "") + "\n" + (art_text or ""), state)
-                    item["stance"] = stance["label"]
-                    item["confidence"] = stance["confidence"]
-
-                results.append(item)
-                seen.add(norm)
-                if len(results) >= limit:
-                    break
-        except Exception:
-            # continue other feeds silently (best-effort)
-            pass
-
-        if len(results) >= limit:
-            break
-
-    results.sort(key=lambda x: x.get("published_at") or "", reverse=True)
-    _set_cached(key, results)
-    return results
+import asyncio, itertools, threading
+import datetime as dt
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Iterator, List, Optional, Dict, Tuple
+from urllib.parse import urlsplit
+import pytz, re, time, os
+
+from .sources import NATIONAL_FEEDS, STATE_FEEDS
+from .feeds import USER_AGENT, iter_feeds, newest_first
+from .classify import category_scores, stance_for_state_politics
+from .utils import within_days_ist, summary_from_text, strip_html
+from .summarize import summarize_batch
+from . import aio, persist, singleflight, trace
+from .cluster import cluster_records
+from .lru import LRUCache
+from .metrics import STAGE_SECONDS, register_cache, timed
+from .store import STORE_DAYS, STORE_MAX_ITEMS, get_records, on_refresh, register, store_key, version
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# In-memory result cache (per process): bounded by entries and approximate bytes,
+# entries die with their store version, TTL or LRU eviction
+_CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(15 * 60)))  # default 15 min
+FETCH_CACHE_MAX_BYTES = int(os.getenv("FETCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+FETCH_CACHE_MAX_ENTRIES = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", "512"))
+_CACHE = LRUCache(FETCH_CACHE_MAX_BYTES, FETCH_CACHE_MAX_ENTRIES, _CACHE_TTL_SECONDS)
+register_cache("results", _CACHE.stats)
+
+DEEP_MODE_ENABLED = os.getenv("DEEP_MODE_ENABLED", "1") == "1"  # allow disabling newspaper3k entirely on free hosts
+
+# Deep mode: articles are extracted in parallel, politely per publisher host, within a request budget.
+# Downloads (and the per-host waits) are coroutines on the I/O loop; only newspaper3k's
+# parse takes one of the DEEP_WORKERS article threads.
+DEEP_WORKERS = int(os.getenv("DEEP_WORKERS", "8"))
+DEEP_PER_HOST = int(os.getenv("DEEP_PER_HOST", "2"))                        # concurrent downloads per host
+DEEP_HOST_DELAY_SECONDS = float(os.getenv("DEEP_HOST_DELAY_SECONDS", "0.4"))  # min gap between starts per host
+DEEP_BUDGET_SECONDS = float(os.getenv("DEEP_BUDGET_SECONDS", "20"))          # then fall back to RSS text
+ARTICLE_TIMEOUT_SECONDS = 12
+_ARTICLE_POOL = ThreadPoolExecutor(max_workers=DEEP_WORKERS, thread_name_prefix="article")
+_HOSTS: Dict[str, Dict] = {}  # host -> {"sem": asyncio.Semaphore, "next": loop time of next allowed start}; I/O loop only
+
+def _cache_key(scope: str, state: Optional[str], category: Optional[str], days: int, limit: int, fetch_mode: str) -> str:
+    return f"{scope}|{state or ''}|{category or ''}|{days}|{limit}|{fetch_mode}"
+
+def _get_cached(key: str, store_version: int = 0) -> Optional[List[Dict]]:
+    return _CACHE.get(key, store_version)
+
+def _set_cached(key: str, value: List[Dict], store_version: int = 0):
+    _CACHE.put(key, value[:], store_version)
+
+def cache_stats() -> Dict[str, int]:
+    return _CACHE.stats()
+
+def _parse_pub_date(entry) -> Optional[dt.datetime]:
+    tstruct = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
+    if not tstruct:
+        return None
+    try:
+        return dt.datetime(*tstruct[:6], tzinfo=pytz.UTC).astimezone(IST)
+    except Exception:
+        return None
+
+async def _get_html(url: str) -> str:
+    r = await aio.client().get(url, headers={"User-Agent": USER_AGENT}, timeout=ARTICLE_TIMEOUT_SECONDS)
+    r.raise_for_status()
+    return r.text
+
+def _parse_article(url: str, html: str) -> Dict:
+    """newspaper3k over a page we already downloaded (article pool thread); persists the text."""
+    from newspaper import Article, Config  # lazy import
+
+    cfg = Config()
+    cfg.browser_user_agent = USER_AGENT
+    cfg.request_timeout = ARTICLE_TIMEOUT_SECONDS
+    cfg.memoize_articles = False
+    cfg.fetch_images = False
+    with trace.span("extract_parse"):
+        art = Article(url, config=cfg)
+        art.download(input_html=html)
+        art.parse()
+    text = (art.text or "").strip()
+    title = (art.title or "").strip()
+    pub = None
+    try:
+        if art.publish_date:
+            pub = art.publish_date.astimezone(IST).isoformat()
+    except Exception:
+        pub = None
+    if text:
+        persist.put_article(url, title, text, pub)
+    return {"title": title, "text": text, "published_at": pub}
+
+def _import_newspaper():
+    import newspaper  # noqa: F401  (first import is slow; keep it off the I/O loop)
+
+def _host_slot(host: str) -> Dict:
+    loop = asyncio.get_running_loop()
+    h = _HOSTS.get(host)
+    if h is None or h["loop"] is not loop:  # the I/O loop is recreated when the app restarts
+        h = _HOSTS[host] = {"sem": asyncio.Semaphore(DEEP_PER_HOST), "next": 0.0, "loop": loop}
+    return h
+
+async def _download_article(url: str, retries: int = 1) -> Dict:
+    """
+    Lazy-import newspaper3k to avoid startup import failures on Render (lxml_html_clean).
+    If import fails or DEEP_MODE_ENABLED=0, return empty text -> caller will fall back.
+    Runs on the I/O loop: the page is fetched on the shared client behind the per-host
+    concurrency cap and politeness gap (awaited, not slept on a thread); newspaper3k
+    only parses it, on the article pool.
+    """
+    if not DEEP_MODE_ENABLED:
+        return {"title": "", "text": "", "published_at": None, "err": "deep_mode_disabled"}
+
+    loop = asyncio.get_running_loop()
+    stored = await loop.run_in_executor(_ARTICLE_POOL, persist.get_article, url)
+    if stored and stored["text"]:
+        return stored
+
+    try:
+        await loop.run_in_executor(_ARTICLE_POOL, _import_newspaper)
+    except Exception as e:
+        return {"title": "", "text": "", "published_at": None, "err": f"newspaper_import_failed:{e.__class__.__name__}"}
+
+    h = _host_slot(urlsplit(url).netloc.lower())
+    last_err = None
+    async with h["sem"]:
+        for _ in range(retries + 1):
+            start = max(loop.time(), h["next"])  # retries wait their turn too
+            h["next"] = start + DEEP_HOST_DELAY_SECONDS
+            await asyncio.sleep(start - loop.time())
+            try:
+                with trace.span("extract_download"):
+                    html = await asyncio.wait_for(_get_html(url), ARTICLE_TIMEOUT_SECONDS + 1)
+                return await loop.run_in_executor(_ARTICLE_POOL, trace.wrap(_parse_article), url, html)
+            except Exception as e:
+                last_err = e
+    return {"title": "", "text": "", "published_at": None, "err": f"download_failed:{type(last_err).__name__ if last_err else 'unknown'}"}
+
+def _extract_iter(urls: List[str], timeout: float) -> Iterator[Tuple[str, Dict]]:
+    """Extract articles in parallel, yielding (url, article) as each finishes within `timeout`."""
+    futures = {aio.submit(_download_article(u)): u for u in urls}
+    try:
+        for f in as_completed(futures, timeout=max(0.0, timeout)):
+            try:
+                yield futures[f], f.result()
+            except Exception:
+                pass
+    except FuturesTimeout:
+        pass
+    finally:
+        for f in futures:
+            f.cancel()  # past the budget: stop waiting for a host slot or the page
+
+def _extract_many(urls: List[str], timeout: float) -> Dict[str, Dict]:
+    """Extract articles in parallel; returns only those that finished within `timeout`."""
+    return dict(_extract_iter(urls, timeout))
+
+def _classify(title: str, desc: str, fulltext: str, scope: str, state: Optional[str]) -> Dict:
+    """
+    Tag once at ingest: every category with its keyword score (title + description +
+    body, substring rule of text_contains_any), plus the governance stance for state items.
+    """
+    cats = category_scores(" ".join([title or "", desc or "", fulltext or ""]))
+    stance = None
+    if scope == "state" and state:
+        stance = stance_for_state_politics((title or "") + "\n" + (fulltext or ""), state)
+    return {"cats": cats, "stance": stance}
+
+def _collect_feeds(scope: str, state: Optional[str]) -> List[str]:
+    if scope == "national":
+        return NATIONAL_FEEDS
+    if scope == "state":
+        return STATE_FEEDS.get(state or "", []) or []
+    return []
+
+MAX_PER_FEED = 80  # newest entries read from each feed per load
+
+# A load in progress publishes the feeds parsed so far after each one lands:
+# store key -> (generation, feed urls, {url: parsed feed}). Cold streams wait on it.
+_PROGRESS: Dict[str, Tuple[int, List[str], Dict[str, Optional[object]]]] = {}
+_PROGRESS_COND = threading.Condition()
+_PROGRESS_GEN = itertools.count(1)
+
+def _entry_record(entry, feed, pub_dt: dt.datetime, scope: str, state: Optional[str], seen: set) -> Optional[Dict]:
+    """One classified (not yet summarized) store record; None for malformed entries or URLs in `seen`."""
+    try:
+        link = (entry.get("link") or "").strip()
+        if not link:
+            return None
+        norm = link.split("?", 1)[0].rstrip("/")
+        if norm in seen:
+            return None
+
+        source_title = ""
+        try:
+            source_title = feed.feed.get("title", "")
+        except Exception:
+            pass
+        title = (entry.get("title") or "").strip()
+        desc = strip_html(entry.get("description") or "")
+
+        rec = {
+            "item": {
+                "title": title or "(untitled)",
+                "url": norm,
+                "published_at": pub_dt.isoformat(),
+                "summary": "",
+                "source": source_title,
+                "state": state if scope == "state" else None,
+            },
+            "pub": pub_dt,
+            "title": title,
+            "desc": desc,
+            "text": desc,
+            **_classify(title, desc, desc, scope, state),
+        }
+        rec["item"]["categories"] = _ranked(rec["cats"])
+        seen.add(norm)
+        return rec
+    except Exception:
+        # skip malformed entries silently (best-effort)
+        return None
+
+def _summarize_records(records: List[Dict]):
+    """One batched summarize pass (persisted summaries + in-process memo skip repeats)."""
+    pending = [(r["item"]["url"], r["title"], r["desc"]) for r in records]
+    summaries = persist.cached_summaries(pending, 900, _summarize_many)
+    for rec, summary in zip(records, summaries):
+        rec["item"]["summary"] = summary
+
+def _combine(scope: str, state: Optional[str], feeds: List[str], parsed: Dict[str, Optional[object]],
+             max_per_feed: int, built: Dict[int, Optional[Dict]], measure: bool = True) -> List[Dict]:
+    """
+    Store records from the feeds parsed so far: newest first inside the store window and
+    size cap, one per URL and per cluster of near-duplicates, summarized. `built` keeps
+    each entry's record across calls on the same `parsed`, so a feed that lands later
+    doesn't re-classify the others. measure=False keeps the stage metrics to real loads.
+    """
+    stage = (lambda name: timed(STAGE_SECONDS, stage=name)) if measure else (lambda name: nullcontext())
+    records: List[Dict] = []
+    seen = set()
+    # newest first across all feeds; stop at the store window or the size cap, so
+    # nothing older is classified or summarized
+    with stage("classify"), trace.span("classify"):
+        for pub_dt, feed, entry in newest_first(parsed, feeds, _parse_pub_date, max_per_feed):
+            if not within_days_ist(pub_dt, STORE_DAYS) or len(records) >= STORE_MAX_ITEMS:
+                break
+            if id(entry) not in built:
+                built[id(entry)] = _entry_record(entry, feed, pub_dt, scope, state, set())
+            rec = built[id(entry)]
+            if rec is not None and rec["item"]["url"] not in seen:
+                seen.add(rec["item"]["url"])
+                records.append(rec)
+
+    # one story per cluster of near-duplicates, then summarize what's left
+    with stage("cluster"), trace.span("cluster"):
+        records = cluster_records(records, key=store_key(scope, state))
+    with stage("summarize"):
+        _summarize_records(records)
+    return records
+
+def _load_records(scope: str, state: Optional[str], max_per_feed: int = MAX_PER_FEED) -> List[Dict]:
+    """
+    Fetch + summarize the newest feed entries of scope/state inside the store window (light
+    mode). Feeds are taken as they land; the ones parsed so far are published for cold
+    streams to build provisional records from (see _provisional_items).
+    """
+    skey = store_key(scope, state)
+    feeds = _collect_feeds(scope, state)
+    parsed: Dict[str, Optional[object]] = {}
+    try:
+        with timed(STAGE_SECONDS, stage="fetch"):
+            for url, feed in iter_feeds(feeds):  # all feeds in flight at once
+                parsed[url] = feed
+                with _PROGRESS_COND:
+                    _PROGRESS[skey] = (next(_PROGRESS_GEN), feeds, dict(parsed))
+                    _PROGRESS_COND.notify_all()
+    finally:
+        with _PROGRESS_COND:
+            _PROGRESS.pop(skey, None)
+    return _combine(scope, state, feeds, parsed, max_per_feed, {})
+
+def _summarize_many(docs: List[Tuple[str, str]]) -> List[str]:
+    with trace.span("summarize"):
+        return [s or summary_from_text(text, title, 900) for (title, text), s in zip(docs, summarize_batch(docs, 900))]
+
+def _ranked(cats: Dict[str, int]) -> List[str]:
+    """Category tags, strongest keyword score first."""
+    return sorted(cats, key=lambda c: -cats[c])
+
+def _with_stance(item: Dict, category: Optional[str], stance: Optional[Dict]) -> Dict:
+    if category == "politics" and stance:
+        item["stance"] = stance["label"]
+        item["confidence"] = stance["confidence"]
+    return item
+
+def _light_item(rec: Dict, scope: str, state: Optional[str], category: Optional[str]) -> Optional[Dict]:
+    """Store record as-is (RSS text); None if it isn't tagged with the category."""
+    if category and category not in rec["cats"]:
+        return None
+    return _with_stance(dict(rec["item"], category=category or "all"), category, rec["stance"])
+
+def _deep_item(rec: Dict, a: Dict, scope: str, state: Optional[str], category: Optional[str]) -> Optional[Dict]:
+    """Store record re-read with the extracted article `a`; None if it drops out of the category."""
+    base, desc = rec["item"], rec["desc"]
+    art_title = a.get("title") or base["title"]
+    art_text = a.get("text") or desc  # may be empty if import failed
+    tags = _classify(art_title, desc, art_text, scope, state)  # full body → its own tags
+    if a.get("text"):
+        persist.set_categories(base["url"], _ranked(tags["cats"]))
+    if category and category not in tags["cats"]:
+        return None
+    summary = persist.cached_summary(base["url"], art_title, art_text, 900, lambda: _summarize_many([(art_title, art_text)])[0])
+    item = dict(base, title=art_title or base["title"], summary=summary, category=category or "all",
+                categories=_ranked(tags["cats"]))
+    item["published_at"] = a.get("published_at") or base["published_at"]
+    return _with_stance(item, category, tags["stance"])
+
+def _iter_query(records: List[Dict], scope: str, state: Optional[str], category: Optional[str],
+                days: int, limit: int, fetch_mode: str) -> Iterator[Dict]:
+    """Items of one get_news result as they become ready (deep items as their article lands)."""
+    count = 0
+    cands = [rec for rec in records if within_days_ist(rec["pub"], days)]
+    if fetch_mode == "deep":
+        # extract in waves sized to what's still missing; once the budget is spent the
+        # remaining candidates fall back to their RSS description
+        deadline = time.monotonic() + DEEP_BUDGET_SECONDS
+        i = 0
+        while i < len(cands) and count < limit and time.monotonic() < deadline:
+            wave = {r["item"]["url"]: r for r in cands[i:i + max(limit - count, DEEP_WORKERS)]}
+            i += len(wave)
+            for url, a in _extract_iter(list(wave), deadline - time.monotonic()):
+                item = _deep_item(wave.pop(url), a, scope, state, category)
+                if item is not None and count < limit:
+                    count += 1
+                    yield item
+            for rec in wave.values():  # not extracted in time
+                item = _light_item(rec, scope, state, category)
+                if item is not None and count < limit:
+                    count += 1
+                    yield item
+        cands = cands[i:]
+    for rec in cands:
+        if count >= limit:
+            break
+        item = _light_item(rec, scope, state, category)
+        if item is not None:
+            count += 1
+            yield item
+
+def _query(records: List[Dict], skey: str, key: str, scope: str, state: Optional[str],
+           category: Optional[str], days: int, limit: int, fetch_mode: str) -> List[Dict]:
+    """Filter store records down to one get_news result and cache it."""
+    with trace.span("filter"):
+        results = list(_iter_query(records, scope, state, category, days, limit, fetch_mode))
+    with trace.span("sort"):
+        results.sort(key=lambda x: x.get("published_at") or "", reverse=True)
+    _set_cached(key, results, version(skey))
+    return results
+
+def known_scope(scope: str, state: Optional[str] = None) -> bool:
+    """Only configured scopes/states have a store key (and with it an index, trending, refreshes, a snapshot)."""
+    return scope == "national" or (scope == "state" and state in STATE_FEEDS)
+
+def load_scope(scope: str, state: Optional[str] = None) -> List[Dict]:
+    """Make sure the store entry for scope/state is loaded (stale-while-revalidate); returns its records."""
+    return get_records(store_key(scope, state))
+
+def get_news(
+    scope: str,
+    state: Optional[str],
+    category: Optional[str],
+    days: int,
+    limit: int,
+    fetch_mode: str = "light",
+) -> List[Dict]:
+    """Query the shared item store (filled from RSS once per TTL) with caching."""
+    state = state if scope == "state" else None
+    if not known_scope(scope, state):
+        return []
+    days = max(1, min(STORE_DAYS, int(days)))
+    limit = max(1, min(200, int(limit)))
+    fetch_mode = "deep" if (fetch_mode == "deep" and DEEP_MODE_ENABLED) else "light"
+
+    skey = store_key(scope, state)
+    records = load_scope(scope, state)
+    key = _cache_key(scope, state, category, days, limit, fetch_mode)
+    cached = _get_cached(key, version(skey))  # results die with the store generation they came from
+    if cached is not None:
+        return cached
+    # identical concurrent misses (TTL rollover, parallel frontend calls) share one pass
+    return singleflight.do("news|" + key, lambda: _query(records, skey, key, scope, state, category, days, limit, fetch_mode))
+
+def _provisional_items(scope: str, state: Optional[str], category: Optional[str],
+                       days: int, limit: int) -> Iterator[Dict]:
+    """
+    Light items for a key that was never loaded, while its load runs on another thread:
+    after each feed lands, the feeds parsed so far go through the loader's own pipeline
+    (_combine: record, dedupe, cluster, summarize) and the query picks from that. An
+    item is yielded again when a later feed changes it; returns once the load is done.
+    """
+    skey = store_key(scope, state)
+    done = threading.Event()
+
+    def load():
+        try:
+            load_scope(scope, state)
+        except Exception:
+            pass  # the caller's own load_scope reports it
+        finally:
+            with _PROGRESS_COND:
+                done.set()
+                _PROGRESS_COND.notify_all()
+
+    threading.Thread(target=trace.wrap(load), daemon=True).start()
+    gen, built, sent = 0, {}, {}
+    while True:
+        with _PROGRESS_COND:
+            _PROGRESS_COND.wait_for(lambda: done.is_set() or _PROGRESS.get(skey, (0,))[0] > gen)
+            if done.is_set():
+                return
+            gen, feeds, parsed = _PROGRESS[skey]
+        records = _combine(scope, state, feeds, parsed, MAX_PER_FEED, built, measure=False)
+        for item in _iter_query(records, scope, state, category, days, limit, "light"):
+            if sent.get(item["url"]) != item:
+                sent[item["url"]] = item
+                yield item
+
+def stream_news(
+    scope: str,
+    state: Optional[str],
+    category: Optional[str],
+    days: int,
+    limit: int,
+    fetch_mode: str = "light",
+) -> Iterator[Dict]:
+    """
+    get_news, incrementally. Yields {"event": "item", "item": {...}} frames as items become
+    ready, then one {"event": "done", "count": n, "order": [url, ...]} frame with the final
+    newest-first order. Items come from the store exactly as get_news would pick them (deep
+    items as each article lands). On a key that was never loaded, provisional items are sent
+    as each feed lands; a later frame for the same url replaces the earlier one, and urls
+    missing from "order" were displaced by newer stories and should be dropped.
+    """
+    state = state if scope == "state" else None
+    if not known_scope(scope, state):
+        yield {"event": "done", "count": 0, "order": []}
+        return
+    days = max(1, min(STORE_DAYS, int(days)))
+    limit = max(1, min(200, int(limit)))
+    fetch_mode = "deep" if (fetch_mode == "deep" and DEEP_MODE_ENABLED) else "light"
+
+    skey = store_key(scope, state)
+    key = _cache_key(scope, state, category, days, limit, fetch_mode)
+    provisional: Dict[str, Dict] = {}
+    if version(skey) == 0:
+        for item in _provisional_items(scope, state, category, days, limit):
+            provisional[item["url"]] = item
+            yield {"event": "item", "item": item}
+    sent: List[Dict] = []
+    records = load_scope(scope, state)
+    ver = version(skey)
+    cached = _get_cached(key, ver)
+    fill_cache = cached is None
+    source = iter(cached) if cached is not None else _iter_query(records, scope, state, category, days, limit, fetch_mode)
+    for item in source:
+        sent.append(item)
+        if provisional.get(item["url"]) != item:
+            yield {"event": "item", "item": item}
+    sent.sort(key=lambda x: x.get("published_at") or "", reverse=True)
+    if fill_cache:
+        _set_cached(key, sent, ver)
+    yield {"event": "done", "count": len(sent), "order": [it["url"] for it in sent]}
+
+register(store_key("national"), lambda: _load_records("national", None), pinned=True)
+for _state in STATE_FEEDS:  # loaded on first request, refreshed while read
+    register(store_key("state", _state), lambda s=_state: _load_records("state", s))
+# results built from an older generation of a store key can never hit again
+on_refresh(lambda key, records: _CACHE.drop_where(lambda k: k.startswith(key + "|")))
@@ -0,0 +1,138 @@
+import bisect, heapq, re, threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import store
+from .utils import within_days_ist
+
+# Inverted index over store items (title + summary + source), one per store key.
+# Kept in step with the store: every refresh adds postings for new URLs and drops
+# the ones that left, so queries are posting-list lookups instead of corpus scans.
+# Posting lists are kept sorted by (published_at, url), the store's own order, so a
+# query walks them newest first and stops once it has `limit` items or leaves the
+# day window; it never materializes or sorts the full match set.
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+Key = Tuple[str, str]  # (published_at or "", url): ascending = oldest first, undated before all
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+def _has(postings: List[Key], k: Key) -> bool:
+    i = bisect.bisect_left(postings, k)
+    return i < len(postings) and postings[i] == k
+
+def _unique(keys: Iterator[Key]) -> Iterator[Key]:
+    """Drop repeats from a sorted stream (a doc reached through several tokens or queries)."""
+    prev = None
+    for k in keys:
+        if k != prev:
+            yield k
+            prev = k
+
+def _newest_first(lists: List[List[Key]]) -> Iterator[Key]:
+    return _unique(heapq.merge(*(reversed(p) for p in lists), reverse=True))
+
+class InvertedIndex:
+    def __init__(self):
+        self.docs: Dict[str, Dict] = {}             # url -> {"item", "pub", "blob", "key"}
+        self.postings: Dict[str, List[Key]] = {}    # token -> sorted [(published_at, url)]
+        self._vocab: List[str] = []                 # sorted tokens, for prefix lookups
+        self._vocab_dirty = False
+        self._lock = threading.RLock()
+
+    def _add(self, url: str, rec: Dict):
+        it = rec["item"]
+        blob = f"{it.get('title','')} {it.get('summary','')} {it.get('source','')}".lower()
+        key = (it.get("published_at") or "", url)
+        self.docs[url] = {"item": it, "pub": rec["pub"], "blob": blob, "key": key}
+        for tok in set(tokenize(blob)):
+            p = self.postings.get(tok)
+            if p is None:
+                p = self.postings[tok] = []
+                self._vocab_dirty = True
+            if not p or p[-1] < key:
+                p.append(key)  # the common case: a refresh brings newer items
+            else:
+                bisect.insort(p, key)
+
+    def _remove(self, url: str):
+        doc = self.docs.pop(url, None)
+        if not doc:
+            return
+        key = doc["key"]
+        for tok in set(tokenize(doc["blob"])):
+            p = self.postings.get(tok)
+            if p is not None:
+                i = bisect.bisect_left(p, key)
+                if i < len(p) and p[i] == key:
+                    del p[i]
+                if not p:
+                    del self.postings[tok]
+                    self._vocab_dirty = True
+
+    def sync(self, records: List[Dict]):
+        """Apply a store refresh: index new/changed items, drop vanished ones."""
+        with self._lock:
+            fresh = {r["item"]["url"]: r for r in records}
+            for url in [u for u in self.docs if u not in fresh]:
+                self._remove(url)
+            for url, rec in reversed(list(fresh.items())):  # store order is newest first: append, not insort
+                doc = self.docs.get(url)
+                if doc is not None and doc["item"] == rec["item"]:
+                    doc["item"], doc["pub"] = rec["item"], rec["pub"]  # unchanged → keep postings
+                    continue
+                if doc is not None:
+                    self._remove(url)
+                self._add(url, rec)
+
+    def _prefix(self, prefix: str) -> List[List[Key]]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self.postings)
+            self._vocab_dirty = False
+        out: List[List[Key]] = []
+        i = bisect.bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            out.append(self.postings[self._vocab[i]])
+            i += 1
+        return out
+
+    def _match(self, query: str) -> Iterator[Key]:
+        """
+        Keys of docs whose text contains `query` as a phrase, newest first. Every token but
+        the last must be a whole word, the last may be a prefix ("modi gov" → "Modi
+        government"): the last token's postings are merged lazily and each candidate is
+        probed in the whole words' postings, then checked for the exact phrase.
+        """
+        needle = (query or "").strip().lower()
+        toks = tokenize(needle)
+        if not toks:
+            return iter(())
+        whole = [self.postings.get(t) for t in toks[:-1]]
+        if not all(whole):
+            return iter(())
+        whole.sort(key=len)  # the rarest word rejects most candidates
+        phrase = len(toks) > 1 or needle != toks[0]
+        return (k for k in _newest_first(self._prefix(toks[-1]))
+                if all(_has(p, k) for p in whole) and (not phrase or needle in self.docs[k[1]]["blob"]))
+
+    def search(self, queries: Iterable[str], days: int, limit: Optional[int] = None) -> List[Dict]:
+        """Items matching ANY of `queries` within `days`, newest first."""
+        out: List[Dict] = []
+        with self._lock:
+            for _, url in _unique(heapq.merge(*(self._match(q) for q in queries), reverse=True)):
+                if limit is not None and len(out) >= limit:
+                    break
+                d = self.docs[url]
+                if not within_days_ist(d["pub"], days):
+                    break  # everything after it is older (or undated)
+                out.append(d)
+        return [dict(d["item"], category=d["item"].get("category") or "all") for d in out]
+
+_INDEXES: Dict[str, InvertedIndex] = {}
+
+def for_key(key: str) -> InvertedIndex:
+    idx = _INDEXES.get(key)
+    if idx is None:
+        idx = _INDEXES.setdefault(key, InvertedIndex())
+    return idx
+
+store.on_refresh(lambda key, records: for_key(key).sync(records))
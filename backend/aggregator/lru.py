@@ -0,0 +1,90 @@
+import sys, threading, time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Bounded LRU with TTL and an approximate byte budget, for result/response caches.
+# Entries carry the store version they were built from; a read with another version
+# is a miss. Expired entries are swept proactively (on writes, at most every ttl/4)
+# instead of waiting for their exact key to be read again.
+
+def approx_size(obj: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes of JSON-like data (dicts, lists, str, numbers)."""
+    if isinstance(obj, (str, bytes)):
+        return sys.getsizeof(obj)
+    if _depth > 4:
+        return 64
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(approx_size(v, _depth + 1) for v in obj)
+    return sys.getsizeof(obj)
+
+class LRUCache:
+    def __init__(self, max_bytes: int, max_entries: int, ttl_seconds: float,
+                 sizeof: Callable[[Any], int] = approx_size):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Dict]" = OrderedDict()  # key -> {"value", "version", "expires", "size"}
+        self._bytes = 0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expired = 0
+
+    def _drop(self, key: Hashable):
+        e = self._data.pop(key)
+        self._bytes -= e["size"]
+
+    def get(self, key: Hashable, version: int = 0) -> Optional[Any]:
+        with self._lock:
+            e = self._data.get(key)
+            if e is not None and (e["version"] != version or e["expires"] <= time.monotonic()):
+                self._drop(key)
+                self.expired += 1
+                e = None
+            if e is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return e["value"]
+
+    def put(self, key: Hashable, value: Any, version: int = 0, size: Optional[int] = None):
+        size = self.sizeof(value) if size is None else size
+        now = time.monotonic()
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if size > self.max_bytes:
+                return  # never cacheable; don't flush everything else for it
+            if now >= self._next_sweep:
+                self._sweep(now)
+            self._data[key] = {"value": value, "version": version, "expires": now + self.ttl, "size": size}
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _sweep(self, now: float):
+        for key in [k for k, e in self._data.items() if e["expires"] <= now]:
+            self._drop(key)
+            self.expired += 1
+        self._next_sweep = now + self.ttl / 4
+
+    def drop_where(self, pred: Callable[[Hashable], bool]):
+        """Proactively retire entries whose key matches (e.g. everything built from one store key)."""
+        with self._lock:
+            for key in [k for k in self._data if pred(k)]:
+                self._drop(key)
+                self.expired += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "expired": self.expired}
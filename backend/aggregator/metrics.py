@@ -0,0 +1,143 @@
+import bisect, threading, time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Minimal Prometheus text-format metrics (no client library): counters, gauges and
+# fixed-bucket histograms with labels, plus collectors that read existing stats
+# (cache counters, breaker state) at scrape time. Updates are a dict lookup + add
+# under one lock, cheap enough to leave on.
+_LOCK = threading.Lock()
+_METRICS: List["_Metric"] = []
+_COLLECTORS: List[Callable[[], List[Tuple[str, str, str, Dict[Tuple, float]]]]] = []
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _labels(names: Sequence[str], values: Tuple) -> str:
+    if not names:
+        return ""
+    esc = [str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values]
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, esc)) + "}"
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labels)
+        self.values: Dict[Tuple, float] = {}
+        _METRICS.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, v in sorted(self.values.items()):
+            out.append(f"{self.name}{_labels(self.labelnames, key)} {v:g}")
+        return out
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        k = self._key(labels)
+        with _LOCK:
+            self.values[k] = self.values.get(k, 0.0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with _LOCK:
+            self.values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple, List[float]] = {}  # key -> per-bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels):
+        k = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with _LOCK:
+            s = self.series.get(k)
+            if s is None:
+                s = self.series[k] = [0.0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        for key, s in sorted(self.series.items()):
+            acc = 0.0
+            for b, c in zip(self.buckets, s):
+                acc += c
+                out.append(f"{self.name}_bucket{_labels(names, key + (f'{b:g}',))} {acc:g}")
+            out.append(f"{self.name}_bucket{_labels(names, key + ('+Inf',))} {s[-1]:g}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {s[-2]:g}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {s[-1]:g}")
+        return out
+
+@contextmanager
+def timed(hist: Histogram, **labels):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        hist.observe(time.perf_counter() - t0, **labels)
+
+def collector(fn: Callable[[], List[Tuple[str, str, str, Dict[Tuple, float]]]]):
+    """
+    Register a scrape-time source: fn() returns [(name, kind, help, {label tuple: value})],
+    label tuples being ((label, value), ...). Failures are skipped.
+    """
+    _COLLECTORS.append(fn)
+
+_CACHES: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+def register_cache(name: str, stats: Callable[[], Dict[str, int]]):
+    """Expose an LRUCache-style stats() dict (hits, misses, evictions, expired, entries, bytes)."""
+    _CACHES[name] = stats
+
+def _cache_series():
+    snap = {name: fn() for name, fn in list(_CACHES.items())}
+    out = []
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                        ("expired", "counter"), ("entries", "gauge"), ("bytes", "gauge")):
+        name = f"newslens_cache_{field}" + ("_total" if kind == "counter" else "")
+        out.append((name, kind, f"Cache {field}", {(("cache", c),): float(st.get(field, 0)) for c, st in snap.items()}))
+    return out
+
+_COLLECTORS.append(_cache_series)
+
+def render() -> str:
+    with _LOCK:
+        lines = [line for m in _METRICS for line in m.render()]
+    for fn in _COLLECTORS:
+        try:
+            for name, kind, help, series in fn():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for labels, value in sorted(series.items()):
+                    names, values = [n for n, _ in labels], tuple(v for _, v in labels)
+                    lines.append(f"{name}{_labels(names, values)} {value:g}")
+        except Exception:
+            continue
+    return "\n".join(lines) + "\n"
+
+# --- pipeline metrics ---
+FEED_FETCH_SECONDS = Histogram("newslens_feed_fetch_seconds", "Feed download time (incl. 304s)", ["feed"])
+FEED_PARSE_SECONDS = Histogram("newslens_feed_parse_seconds", "Feed XML parse time", ["feed"])
+FEED_BYTES = Counter("newslens_feed_bytes_total", "Feed body bytes downloaded", ["feed"])
+FEED_ENTRIES = Gauge("newslens_feed_entries", "Entries in the feed's last parse", ["feed"])
+FEED_NOT_MODIFIED = Counter("newslens_feed_not_modified_total", "Conditional GETs answered 304", ["feed"])
+FEED_ERRORS = Counter("newslens_feed_errors_total", "Feed fetch/parse failures", ["feed", "error"])
+FEED_PARSE_FALLBACK = Counter("newslens_feed_parse_fallback_total", "Feeds the streaming parser handed to feedparser", ["feed"])
+STAGE_SECONDS = Histogram("newslens_stage_seconds", "Ingest stage time per store refresh", ["stage"])
+STORE_REFRESH_SECONDS = Histogram("newslens_store_refresh_seconds", "Store rebuild time (load or adopt)", ["key"])
+STORE_ITEMS = Gauge("newslens_store_items", "Records held per store key", ["key"])
+REQUEST_SECONDS = Histogram("newslens_request_seconds", "HTTP request latency", ["route", "method", "status"])
@@ -0,0 +1,227 @@
+import datetime as dt, json, os, sqlite3, threading, time, uuid, zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .summarize import summary_key
+
+# Persistent article/summary store (SQLite, WAL) so a dyno restart doesn't mean
+# re-downloading every article and re-summarizing every item.
+PERSIST_ENABLED = os.getenv("PERSIST_ENABLED", "1") == "1"
+# Private to this user: the file holds what every worker serves, so no world-writable /tmp.
+_STATE_HOME = os.getenv("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+PERSIST_PATH = os.getenv("NL_STORE_PATH", os.path.join(_STATE_HOME, "newslens", "store.sqlite3"))
+PERSIST_TTL_SECONDS = int(os.getenv("PERSIST_TTL_SECONDS", str(14 * 24 * 3600)))
+# The same file is shared by every worker process on the host (uvicorn --workers N):
+# store snapshots + refresh leases let one worker fetch while the others read.
+SHARED_STORE = os.getenv("SHARED_STORE", "1") == "1"
+_OWNER = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    text TEXT,
+    published_at TEXT,
+    categories TEXT,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    url TEXT,
+    summary TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT PRIMARY KEY,
+    records BLOB NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_ts ON articles(ts);
+CREATE INDEX IF NOT EXISTS summaries_ts ON summaries(ts);
+"""
+
+_CONN: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
+
+def _private_file(path: str):
+    """Create the database (0600, in a 0700 directory if we make one); refuse symlinks and other users' files."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600))
+    os.chmod(path, 0o600)  # raises for a file someone else planted there
+
+def _conn() -> Optional[sqlite3.Connection]:
+    """Open lazily; any failure (read-only disk etc.) just disables persistence."""
+    global _CONN, PERSIST_ENABLED
+    if _CONN is not None or not PERSIST_ENABLED:
+        return _CONN
+    try:
+        _private_file(PERSIST_PATH)
+        c = sqlite3.connect(PERSIST_PATH, check_same_thread=False, isolation_level=None, timeout=5)
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        c.executescript(_SCHEMA)
+        _CONN = c
+        compact()
+    except Exception:
+        PERSIST_ENABLED = False
+    return _CONN
+
+def _exec(sql: str, args=()) -> List[tuple]:
+    c = _conn()
+    if c is None:
+        return []
+    try:
+        with _LOCK:
+            return c.execute(sql, args).fetchall()
+    except Exception:
+        return []
+
+def _executemany(sql: str, rows: List[tuple]):
+    c = _conn()
+    if c is None or not rows:
+        return
+    try:
+        with _LOCK:
+            c.execute("BEGIN")
+            c.executemany(sql, rows)
+            c.execute("COMMIT")
+    except Exception:
+        try:
+            with _LOCK:
+                c.execute("ROLLBACK")
+        except Exception:
+            pass
+
+def get_article(url: str) -> Optional[Dict]:
+    rows = _exec("SELECT title, text, published_at, categories FROM articles WHERE url = ? AND ts >= ?",
+                 (url, time.time() - PERSIST_TTL_SECONDS))
+    if not rows:
+        return None
+    title, text, pub, cats = rows[0]
+    return {"title": title or "", "text": text or "", "published_at": pub, "categories": json.loads(cats or "[]")}
+
+def put_article(url: str, title: str, text: str, published_at: Optional[str], categories: Optional[List[str]] = None):
+    _exec(
+        "INSERT INTO articles (url, title, text, published_at, categories, ts) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(url) DO UPDATE SET title=excluded.title, text=excluded.text, "
+        "published_at=excluded.published_at, categories=COALESCE(excluded.categories, articles.categories), ts=excluded.ts",
+        (url, title, text, published_at, json.dumps(categories) if categories is not None else None, time.time()),
+    )
+
+def set_categories(url: str, categories: List[str]):
+    _exec("UPDATE articles SET categories = ? WHERE url = ?", (json.dumps(categories), url))
+
+def cached_summary(url: str, title: str, text: str, max_chars: int, fn: Callable[[], str]) -> str:
+    """Summary for exactly this (title, text, max_chars); computed by `fn` once and persisted."""
+    return cached_summaries([(url, title, text)], max_chars, lambda docs: [fn()])[0]
+
+def cached_summaries(docs: List[Tuple[str, str, str]], max_chars: int,
+                     fn: Callable[[List[Tuple[str, str]]], List[str]]) -> List[str]:
+    """
+    Batch form: docs are (url, title, text). One lookup for all of them; the misses
+    go to `fn` as a single [(title, text), ...] batch and are written back together.
+    """
+    if not docs:
+        return []
+    if _conn() is None:
+        return fn([(t, x) for _, t, x in docs])
+    keys = [summary_key(t, x, max_chars) for _, t, x in docs]
+    found: Dict[str, str] = {}
+    uniq = list(dict.fromkeys(keys))
+    for i in range(0, len(uniq), 500):  # stay under SQLite's bound-parameter limit
+        chunk = uniq[i:i + 500]
+        rows = _exec(f"SELECT key, summary FROM summaries WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        found.update(rows)
+    miss = [i for i, k in enumerate(keys) if k not in found]
+    if miss:
+        made = fn([(docs[i][1], docs[i][2]) for i in miss])
+        now = time.time()
+        rows = []
+        for i, summary in zip(miss, made):
+            found[keys[i]] = summary
+            if summary:
+                rows.append((keys[i], docs[i][0], summary, now))
+        _executemany("INSERT OR REPLACE INTO summaries (key, url, summary, ts) VALUES (?, ?, ?, ?)", rows)
+    return [found[k] for k in keys]
+
+def compact():
+    """Drop rows older than PERSIST_TTL_SECONDS."""
+    floor = time.time() - PERSIST_TTL_SECONDS
+    _exec("DELETE FROM articles WHERE ts < ?", (floor,))
+    _exec("DELETE FROM summaries WHERE ts < ?", (floor,))
+    _exec("DELETE FROM snapshots WHERE ts < ?", (floor,))
+    _exec("DELETE FROM leases WHERE expires < ?", (time.time(),))
+
+def _shared() -> bool:
+    return SHARED_STORE and _conn() is not None
+
+def acquire_lease(name: str, ttl: float) -> bool:
+    """
+    Try to become the only process working on `name` for `ttl` seconds (re-entrant for
+    the holder). Without a shared database, or if it errors, every caller wins.
+    """
+    if not _shared():
+        return True
+    now = time.time()
+    try:
+        with _LOCK:
+            c = _CONN
+            c.execute(
+                "INSERT INTO leases (name, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner=excluded.owner, expires=excluded.expires "
+                "WHERE leases.expires < ? OR leases.owner = excluded.owner",
+                (name, _OWNER, now + ttl, now),
+            )
+            row = c.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return bool(row) and row[0] == _OWNER
+    except Exception:
+        return True
+
+def release_lease(name: str):
+    if _shared():
+        _exec("DELETE FROM leases WHERE name = ? AND owner = ?", (name, _OWNER))
+
+# Snapshots are JSON: store records are plain dicts/lists/strings/numbers plus the `pub`
+# datetime, which travels as an ISO string.
+_DATETIME_FIELDS = ("pub",)
+
+def _encode(obj):
+    if isinstance(obj, dt.datetime):
+        return obj.isoformat()
+    raise TypeError(f"{type(obj).__name__} in a store record")
+
+def _decode(records: List[Dict]) -> List[Dict]:
+    for rec in records:
+        for f in _DATETIME_FIELDS:
+            if rec.get(f):
+                rec[f] = dt.datetime.fromisoformat(rec[f])
+    return records
+
+def put_snapshot(key: str, records: List[Dict]) -> float:
+    """Publish a store entry for the other workers; returns its timestamp."""
+    ts = time.time()
+    if _shared():
+        try:
+            blob = zlib.compress(json.dumps(records, default=_encode, ensure_ascii=False).encode(), 1)
+        except Exception:
+            return ts
+        _exec("INSERT OR REPLACE INTO snapshots (key, records, ts) VALUES (?, ?, ?)", (key, blob, ts))
+    return ts
+
+def get_snapshot(key: str, newer_than: float = 0.0) -> Optional[Tuple[float, List[Dict]]]:
+    """(ts, records) of the latest published store entry for `key`, if newer than `newer_than`."""
+    if not _shared():
+        return None
+    rows = _exec("SELECT ts, records FROM snapshots WHERE key = ? AND ts > ?", (key, newer_than))
+    if not rows:
+        return None
+    try:
+        return rows[0][0], _decode(json.loads(zlib.decompress(rows[0][1])))
+    except Exception:
+        return None
@@ -0,0 +1,230 @@
+import datetime as dt
+import html.entities
+import xml.parsers.expat as expat
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urljoin
+from feedparser import FeedParserDict
+
+# Incremental RSS 2.0 / RSS 1.0 (RDF) / Atom reader on expat. Entries come out one at a
+# time, as feedparser-style dicts holding only the fields the aggregator reads (title,
+# link, summary, published/updated + *_parsed). Only the entry being read is held in
+# memory, so the caller can stop early (entry cap, date cutoff) and the rest of the
+# document is never downloaded or tokenized. Anything it can't read raises Unsupported,
+# and the caller falls back to feedparser.
+OLD_RUN = 5  # consecutive entries past the cutoff before we assume the rest is older too
+
+_ROOTS = ("rss", "RDF", "feed")
+_ENTRY = ("item", "entry")
+_CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+_NS = {"", "http://www.w3.org/2005/Atom", "http://purl.org/atom/ns#", "http://purl.org/rss/1.0/",
+       "http://purl.org/dc/elements/1.1/", "http://purl.org/dc/terms/"}  # not media:, itunes:, ...
+_HTML_ENTITIES = {k: chr(v) for k, v in html.entities.name2codepoint.items()}  # &nbsp; etc. in DTD-less feeds
+_FIELDS = {  # entry child -> key (first one seen wins)
+    "title": "title", "description": "summary", "summary": "summary", "content": "content",
+    "pubDate": "published", "published": "published", "issued": "published", "date": "updated",  # dc:date, as feedparser
+    "updated": "updated", "modified": "updated",
+}
+
+class Unsupported(ValueError):
+    """Not a feed this reader handles, or nothing usable before the XML broke."""
+
+def _parse_date(s: str) -> Optional[dt.datetime]:
+    s = s.strip()
+    if not s:
+        return None
+    try:
+        d = parsedate_to_datetime(s)  # RFC 822 (RSS pubDate)
+    except (TypeError, ValueError, IndexError):
+        try:
+            d = dt.datetime.fromisoformat(s)  # RFC 3339 (Atom, dc:date)
+        except ValueError:
+            return None
+    return d if d.tzinfo else d.replace(tzinfo=dt.timezone.utc)
+
+class _Reader:
+    def __init__(self, base_url: str, feed: Dict):
+        self.base_url = base_url
+        self.feed = feed
+        self.ready: deque = deque()
+        self.path: List[str] = []
+        self.entry: Optional[Dict] = None  # fields of the entry being read
+        self.entry_depth = 0
+        self.field: Optional[str] = None   # entry key the current text goes to
+        self.field_depth = 0
+        self.text: List[str] = []
+        p = self.parser = expat.ParserCreate(namespace_separator=" ")
+        p.UseForeignDTD(True)
+        p.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+        p.buffer_text = True
+        p.StartElementHandler = self._start
+        p.EndElementHandler = self._end
+        p.CharacterDataHandler = self._chars
+        p.SkippedEntityHandler = self._entity
+
+    def _capture(self, field: str):
+        self.field, self.text, self.field_depth = field, [], len(self.path)
+
+    def _start(self, name: str, attrs: Dict[str, str]):
+        ns, _, local = name.rpartition(" ")
+        if not self.path and local not in _ROOTS:
+            raise Unsupported(f"root element <{local}>")
+        self.path.append(local)
+        if self.field is not None:
+            return  # markup inside a field (Atom xhtml content): keep collecting its text
+        if self.entry is None:
+            if local in _ENTRY:
+                self.entry, self.entry_depth = {}, len(self.path)
+            elif local == "title" and self.path[-2:-1] in (["channel"], ["feed"]) and "title" not in self.feed:
+                self._capture("feed_title")
+            return
+        if local == "encoded" and ns == _CONTENT_NS:
+            self._capture("content")
+        elif ns not in _NS:
+            return
+        elif local == "link":
+            if "href" in attrs:  # Atom
+                if attrs.get("rel", "alternate") == "alternate":
+                    self.entry.setdefault("link", attrs["href"])
+            else:
+                self._capture("link")
+        elif local in ("guid", "id"):
+            if attrs.get("isPermaLink") != "false":
+                self._capture("guid")
+        elif local in _FIELDS:
+            self._capture(_FIELDS[local])
+
+    def _end(self, name: str):
+        depth = len(self.path)
+        self.path.pop()
+        if self.field is not None:
+            if depth == self.field_depth:
+                value = "".join(self.text).strip()
+                if self.field == "feed_title":
+                    self.feed["title"] = value
+                elif value:
+                    self.entry.setdefault(self.field, value)
+                self.field, self.text = None, []
+        elif self.entry is not None and depth == self.entry_depth:
+            self.ready.append(self._finish(self.entry))
+            self.entry = None
+
+    def _chars(self, data: str):
+        if self.field is not None:
+            self.text.append(data)
+
+    def _entity(self, name: str, is_param: bool):
+        if self.field is not None:
+            self.text.append(_HTML_ENTITIES.get(name, ""))
+
+    def _finish(self, f: Dict) -> FeedParserDict:
+        e = FeedParserDict()
+        if f.get("title"):
+            e["title"] = f["title"]
+        link = f.get("link") or (f.get("guid") if f.get("guid", "").startswith("http") else "")
+        if link:
+            e["link"] = urljoin(self.base_url, link) if self.base_url else link
+        summary = f.get("summary") or f.get("content")
+        if summary:
+            e["summary"] = summary
+        for key in ("published", "updated"):
+            if f.get(key):
+                e[key] = f[key]
+                d = _parse_date(f[key])
+                if d is not None:
+                    e[key + "_parsed"] = d.utctimetuple()
+        return e
+
+def _drain(r: _Reader) -> Iterator[FeedParserDict]:
+    while r.ready:
+        yield r.ready.popleft()
+
+def iter_entries(chunks: Iterable[bytes], base_url: str = "", feed: Optional[Dict] = None) -> Iterator[FeedParserDict]:
+    """
+    Entries of the feed whose bytes arrive as `chunks`, each yielded as soon as its closing
+    tag is read. `feed` (if given) receives the channel title. Raises Unsupported or
+    expat.ExpatError where the document stops being a readable feed, after yielding every
+    entry that was complete before that point.
+    """
+    r = _Reader(base_url, {} if feed is None else feed)
+    for chunk in chunks:
+        try:
+            r.parser.Parse(chunk, False)
+        except Exception:
+            yield from _drain(r)
+            raise
+        yield from _drain(r)
+    try:
+        r.parser.Parse(b"", True)
+    finally:
+        yield from _drain(r)
+
+class StreamParser:
+    """
+    Push-style parse for a body that is still downloading: push() each piece as it arrives
+    and stop as soon as it returns False (`max_entries` read, or OLD_RUN consecutive dated
+    entries older than `cutoff`; feeds list newest first, a few out-of-order ones are
+    skipped). close() returns the feedparser-style result.
+
+    Broken XML in the middle of the document raises Unsupported: a raw `&` in one item
+    would otherwise cost every item after it, so the caller hands the whole body to
+    feedparser instead. A document that just ends early (a capped or cut-off download)
+    keeps the entries read so far, with bozo=1.
+    """
+
+    def __init__(self, base_url: str = "", max_entries: int = 0, cutoff: Optional[dt.datetime] = None):
+        self.max_entries = max_entries
+        self.cutoff = cutoff
+        self.feed = FeedParserDict()
+        self.entries: List[FeedParserDict] = []
+        self.done = False
+        self._old = 0
+        self._bozo = 0
+        self._r = _Reader(base_url, self.feed)
+
+    def _take(self):
+        for e in _drain(self._r):
+            if self.done:
+                continue
+            t = e.get("published_parsed") or e.get("updated_parsed")
+            if self.cutoff is not None and t is not None and dt.datetime(*t[:6], tzinfo=dt.timezone.utc) < self.cutoff:
+                self._old += 1
+                self.done = self._old >= OLD_RUN
+                continue
+            self._old = 0
+            self.entries.append(e)
+            self.done = bool(self.max_entries) and len(self.entries) >= self.max_entries
+
+    def push(self, data: bytes) -> bool:
+        """Parse the next piece of the body; False once nothing more is needed."""
+        if self.done:
+            return False
+        try:
+            self._r.parser.Parse(data, False)
+        except expat.ExpatError as exc:
+            raise Unsupported(str(exc)) from exc
+        self._take()
+        return not self.done
+
+    def close(self) -> FeedParserDict:
+        """The parsed feed; call once the body ended or push() returned False."""
+        if not self.done:
+            try:
+                self._r.parser.Parse(b"", True)
+            except expat.ExpatError as exc:
+                self._take()
+                if not self.entries:
+                    raise Unsupported(str(exc)) from exc
+                self._bozo = 1
+            self._take()
+        return FeedParserDict(feed=self.feed, entries=self.entries, bozo=self._bozo)
+
+def parse(body: bytes, base_url: str = "", max_entries: int = 0, cutoff: Optional[dt.datetime] = None,
+          chunk_size: int = 64 * 1024) -> FeedParserDict:
+    """feedparser.parse() stand-in for the fields we use, over a complete body (see StreamParser)."""
+    sp = StreamParser(base_url, max_entries, cutoff)
+    for i in range(0, len(body), chunk_size):
+        if not sp.push(body[i:i + chunk_size]):
+            break
+    return sp.close()
@@ -0,0 +1,40 @@
+import os, random, threading
+from typing import Optional
+
+from . import persist, store
+
+# Background refresh: keeps national, curated-topic and recently-requested state
+# entries warm so steady-state requests never wait on the publishers.
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+REFRESH_INTERVAL_SECONDS = float(os.getenv("REFRESH_INTERVAL_SECONDS", str(10 * 60)))
+REFRESH_JITTER_SECONDS = float(os.getenv("REFRESH_JITTER_SECONDS", "60"))
+ACTIVE_STATE_SECONDS = float(os.getenv("ACTIVE_STATE_SECONDS", str(60 * 60)))
+
+_STOP = threading.Event()
+_THREAD: Optional[threading.Thread] = None
+
+def refresh_all():
+    for key in store.due_keys(ACTIVE_STATE_SECONDS):
+        try:
+            store.refresh(key)
+        except Exception:
+            # one bad scope must not stop the others (best-effort)
+            pass
+
+def _run():
+    while not _STOP.is_set():
+        refresh_all()
+        persist.compact()
+        delay = REFRESH_INTERVAL_SECONDS + random.uniform(-REFRESH_JITTER_SECONDS, REFRESH_JITTER_SECONDS)
+        _STOP.wait(max(5.0, delay))
+
+def start():
+    global _THREAD
+    if not SCHEDULER_ENABLED or (_THREAD and _THREAD.is_alive()):
+        return
+    _STOP.clear()
+    _THREAD = threading.Thread(target=_run, name="feed-scheduler", daemon=True)
+    _THREAD.start()
+
+def stop():
+    _STOP.set()
@@ -0,0 +1,32 @@
+import threading
+from typing import Any, Callable, Dict
+
+# Single-flight: concurrent callers with the same key share one execution of fn
+# (the first caller runs it, the rest block and receive its result or exception).
+_CALLS: Dict[str, Dict] = {}
+_LOCK = threading.Lock()
+
+def do(key: str, fn: Callable[[], Any]) -> Any:
+    with _LOCK:
+        call = _CALLS.get(key)
+        leader = call is None
+        if leader:
+            call = _CALLS[key] = {"done": threading.Event(), "result": None, "error": None}
+    if not leader:
+        call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+    try:
+        call["result"] = fn()
+        return call["result"]
+    except BaseException as e:
+        call["error"] = e
+        raise
+    finally:
+        with _LOCK:
+            _CALLS.pop(key, None)
+        call["done"].set()
+
+def in_flight(key: str) -> bool:
+    return key in _CALLS
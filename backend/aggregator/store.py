@@ -0,0 +1,138 @@
+import datetime as dt
+import os, threading, time
+from typing import Callable, Dict, List, Optional
+
+from . import metrics, persist, singleflight
+
+# Canonical, de-duplicated item store: one entry per scope/state, always filled
+# with the widest window so every endpoint's (category, days, limit) is a cheap
+# in-memory query instead of its own fetch + summarize pass.
+STORE_DAYS = 14
+STORE_MAX_ITEMS = int(os.getenv("STORE_MAX_ITEMS", "1500"))  # per key; ingest keeps the newest
+STORE_LEASE_SECONDS = int(os.getenv("STORE_LEASE_SECONDS", "120"))  # one worker refreshes a key at a time
+_STORE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(15 * 60)))
+_STORE: Dict[str, Dict] = {}  # key -> {"ts": datetime, "shared_ts": epoch, "version": int, "records": [record, ...]}
+
+# key -> loader; pinned keys are refreshed by the scheduler even when nobody asks for them
+_LOADERS: Dict[str, Callable[[], List[Dict]]] = {}
+_PINNED = set()
+_LAST_ACCESS: Dict[str, float] = {}
+_LISTENERS: List[Callable[[str, List[Dict]], None]] = []  # called with (key, records) after each rebuild
+
+def store_key(scope: str, state: str = "") -> str:
+    return f"{scope}|{state or ''}"
+
+def register(key: str, loader: Callable[[], List[Dict]], pinned: bool = False):
+    _LOADERS[key] = loader
+    if pinned:
+        _PINNED.add(key)
+
+def on_refresh(fn: Callable[[str, List[Dict]], None]):
+    """Subscribe derived structures (search index, trending, ...) to store rebuilds."""
+    _LISTENERS.append(fn)
+
+def _is_fresh(it: Dict) -> bool:
+    return (dt.datetime.utcnow() - it["ts"]).total_seconds() <= _STORE_TTL_SECONDS
+
+def _metric_key(key: str) -> str:
+    """Store keys as a metric label: registered (configured) keys only, so series stay bounded."""
+    return key if key in _LOADERS else "other"
+
+def _install(key: str, records: List[Dict], ts: float) -> List[Dict]:
+    records.sort(key=lambda r: r["item"].get("published_at") or "", reverse=True)
+    prev = _STORE.get(key)
+    metrics.STORE_ITEMS.set(len(records), key=_metric_key(key))
+    _STORE[key] = {
+        "ts": dt.datetime.utcfromtimestamp(ts),  # when the data was loaded, by whichever worker
+        "shared_ts": ts,
+        "version": (prev["version"] + 1) if prev else 1,
+        "records": records,
+    }
+    for fn in _LISTENERS:
+        try:
+            fn(key, records)
+        except Exception:
+            pass
+    return records
+
+def _rebuild(key: str, loader: Callable[[], List[Dict]]) -> List[Dict]:
+    """
+    Load `key` once across all worker processes on the host: adopt a fresher snapshot
+    another worker published, else take the lease and load + publish one, else wait for
+    the lease holder's snapshot (and load it ourselves if it never shows up).
+    """
+    prev = _STORE.get(key)
+    floor = max(prev["shared_ts"] if prev else 0.0, time.time() - _STORE_TTL_SECONDS)
+    lease = "store|" + key
+    deadline = time.monotonic() + STORE_LEASE_SECONDS
+    while time.monotonic() < deadline:
+        snap = persist.get_snapshot(key, newer_than=floor)
+        if snap:
+            return _install(key, snap[1], snap[0])
+        if persist.acquire_lease(lease, STORE_LEASE_SECONDS):
+            try:
+                records = loader()
+                return _install(key, records, persist.put_snapshot(key, records))
+            finally:
+                persist.release_lease(lease)
+        time.sleep(0.25)
+    records = loader()
+    return _install(key, records, persist.put_snapshot(key, records))
+
+def refresh(key: str) -> Optional[List[Dict]]:
+    """
+    Rebuild `key` with its registered loader (None if unknown).
+    Coalesced: callers arriving while a rebuild of `key` is running wait for and share it.
+    """
+    loader = _LOADERS.get(key)
+    if loader is None:
+        return None
+    def timed_rebuild():
+        with metrics.timed(metrics.STORE_REFRESH_SECONDS, key=_metric_key(key)):
+            return _rebuild(key, loader)
+    return singleflight.do("store|" + key, timed_rebuild)
+
+def _refresh_in_background(key: str):
+    if singleflight.in_flight("store|" + key):
+        return
+    threading.Thread(target=refresh, args=(key,), daemon=True).start()
+
+def get_records(key: str) -> List[Dict]:
+    """
+    Records for a registered `key`, newest first ([] for an unknown key: keys come from
+    configuration, never from request input).
+    Stale-while-revalidate: a stale entry is returned immediately and rebuilt on a
+    background thread; only a key that was never loaded pays the fetch in-request.
+    A record is {"item": public item dict, "pub": datetime|None, "desc": str, "text": str}.
+    """
+    if key not in _LOADERS:
+        return []
+    it = _STORE.get(key)
+    if it:
+        touch(key)
+        return it["records"]
+    _LAST_ACCESS[key] = time.monotonic()
+    return refresh(key)
+
+def touch(key: str):
+    """
+    Note a read of `key` served from something derived from it (a cached response): keeps
+    the key on the scheduler's active list and revalidates it in the background if stale.
+    """
+    if key not in _LOADERS:
+        return
+    _LAST_ACCESS[key] = time.monotonic()
+    it = _STORE.get(key)
+    if it and not _is_fresh(it):
+        _refresh_in_background(key)
+
+def version(key: str) -> int:
+    """Bumped on every refresh; 0 if never loaded."""
+    it = _STORE.get(key)
+    return it["version"] if it else 0
+
+def due_keys(active_seconds: float) -> List[str]:
+    """Pinned keys plus any key read within the last `active_seconds`."""
+    now = time.monotonic()
+    active = [k for k, t in list(_LAST_ACCESS.items()) if now - t <= active_seconds and k in _LOADERS]
+    return list(dict.fromkeys(list(_PINNED) + active))
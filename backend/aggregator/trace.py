@@ -0,0 +1,117 @@
+import contextvars, os, sys, threading, time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Per-request stage timings. A request activates a Trace in a contextvar; span(name)
+# adds its wall time to that trace (a no-op outside a request). Pool threads and the
+# I/O loop don't inherit contextvars on their own, so work handed to them goes through
+# wrap() / within(). Durations of the same stage are summed across threads.
+_CURRENT: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("nl_trace", default=None)
+
+class Trace:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}  # name -> [seconds, count]
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            s = self.spans.setdefault(name, [0.0, 0])
+            s[0] += seconds
+            s[1] += 1
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; desc carries how many spans were summed."""
+        with self._lock:
+            parts = [f'{n};dur={s[0] * 1000:.1f};desc="{s[1]}x"' for n, s in self.spans.items()]
+        parts.append(f"total;dur={(time.perf_counter() - self.t0) * 1000:.1f}")
+        return ", ".join(parts)
+
+def activate() -> contextvars.Token:
+    return _CURRENT.set(Trace())
+
+def deactivate(token: contextvars.Token):
+    _CURRENT.reset(token)
+
+def current() -> Optional[Trace]:
+    return _CURRENT.get()
+
+@contextmanager
+def use(t: Optional[Trace]):
+    """Make `t` the current trace for the block (e.g. each step of a streamed body, which
+    runs after the request's own trace was deactivated)."""
+    token = _CURRENT.set(t)
+    try:
+        yield t
+    finally:
+        _CURRENT.reset(token)
+
+@contextmanager
+def span(name: str):
+    t = _CURRENT.get()
+    if t is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        t.add(name, time.perf_counter() - t0)
+
+def wrap(fn: Callable) -> Callable:
+    """Bind `fn` to the caller's context, for executor submissions."""
+    if _CURRENT.get() is None:
+        return fn
+    ctx = contextvars.copy_context()
+    return lambda *a, **kw: ctx.run(fn, *a, **kw)
+
+async def within(t: Optional[Trace], coro: Awaitable) -> Any:
+    """Run `coro` (on another loop) as part of trace `t`."""
+    _CURRENT.set(t)
+    return await coro
+
+# ---------- opt-in sampling profiler ----------
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.005"))
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", os.path.join("concurrent", "futures", "thread.py"))
+
+class Profiler:
+    """
+    Samples every thread's Python stack while a request runs and returns folded stacks
+    ("outer;inner;leaf count" lines), ready for flamegraph.pl or speedscope. Threads
+    parked in a pool/queue/selector wait are skipped.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(ident, "thread"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.samples.most_common())
@@ -0,0 +1,103 @@
+import datetime as dt
+import math, re, threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from . import store
+from .utils import now_ist, IST
+
+# Trending terms, counted once per item at ingest into per-day (IST) buckets.
+# A days=N query merges N buckets instead of re-tokenizing the corpus.
+STOPWORDS = set("""
+a an and are as at be by for from has have he her his i in is it its of on or our so
+that the their them there they this to was were will with you your
+""".split())
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-\&]{2,}")
+BASELINE_DAYS = 7  # burst mode compares the window against this many days before it
+
+def extract_terms(title: str, summary: str) -> List[str]:
+    blob = f"{title or ''} {summary or ''}"
+    words = WORD_RE.findall(blob)
+    terms = []
+    for w in words:
+        u = w.strip().title()
+        if len(u) < 3:
+            continue
+        if u.lower() in STOPWORDS:
+            continue
+        terms.append(u)
+    return terms
+
+def _day(pub: Optional[dt.datetime]) -> Optional[dt.date]:
+    return pub.astimezone(IST).date() if pub else None
+
+class TermBuckets:
+    def __init__(self):
+        self.buckets: Dict[dt.date, Counter] = {}
+        self.counted: Dict[str, tuple] = {}  # url -> (day, Counter of its terms)
+        self._lock = threading.Lock()
+
+    def sync(self, records: List[Dict]):
+        """Count new items once, un-count items that left the store."""
+        with self._lock:
+            fresh = {r["item"]["url"]: r for r in records}
+            for url in [u for u in self.counted if u not in fresh]:
+                day, terms = self.counted.pop(url)
+                b = self.buckets.get(day)
+                if b is not None:
+                    b.subtract(terms)
+                    for t in [t for t in terms if b[t] <= 0]:
+                        del b[t]
+                    if not b:
+                        del self.buckets[day]
+            for url, rec in fresh.items():
+                if url in self.counted:
+                    continue
+                day = _day(rec["pub"])
+                if day is None:
+                    continue
+                it = rec["item"]
+                terms = Counter(extract_terms(it.get("title", ""), it.get("summary", "")))
+                self.buckets.setdefault(day, Counter()).update(terms)
+                self.counted[url] = (day, terms)
+
+    def top(self, days: int, n: int = 25, mode: str = "count", half_life_days: float = 1.0) -> List[Dict]:
+        """
+        mode="count": plain counts over the last `days` days (today included).
+        mode="decay": counts weighted by 0.5 ** (age_days / half_life_days).
+        mode="burst": window rate vs. the BASELINE_DAYS before it, so rising terms beat always-frequent ones.
+        """
+        today = now_ist().date()
+        window = [today - dt.timedelta(days=i) for i in range(max(1, days))]
+        with self._lock:
+            counts = Counter()
+            for d in window:
+                counts.update(self.buckets.get(d, {}))
+            if mode == "count":
+                return [{"term": k, "count": v} for k, v in counts.most_common(n)]
+            scores: Dict[str, float] = {}
+            if mode == "decay":
+                for i, d in enumerate(window):
+                    w = 0.5 ** (i / max(half_life_days, 0.01))
+                    for t, c in self.buckets.get(d, {}).items():
+                        scores[t] = scores.get(t, 0.0) + w * c
+            else:
+                base = Counter()
+                for i in range(len(window), len(window) + BASELINE_DAYS):
+                    base.update(self.buckets.get(today - dt.timedelta(days=i), {}))
+                for t, c in counts.items():
+                    rate = c / len(window)
+                    base_rate = base.get(t, 0) / BASELINE_DAYS
+                    scores[t] = rate * math.log((rate + 1.0) / (base_rate + 1.0) + 1.0)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:n]
+        return [{"term": t, "count": counts.get(t, 0), "score": round(s, 3)} for t, s in ranked]
+
+_BUCKETS: Dict[str, TermBuckets] = {}
+
+def for_key(key: str) -> TermBuckets:
+    b = _BUCKETS.get(key)
+    if b is None:
+        b = _BUCKETS.setdefault(key, TermBuckets())
+    return b
+
+store.on_refresh(lambda key, records: for_key(key).sync(records))
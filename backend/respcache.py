@@ -0,0 +1,144 @@
+import gzip, hashlib, json, os
+from typing import Any, Callable, Dict
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from backend.aggregator import metrics, store, trace
+from backend.aggregator.lru import LRUCache
+
+try:
+    import brotli  # optional: br variants only when installed
+except Exception:
+    brotli = None
+
+# Pre-serialized responses: final body bytes + gzip/br variants, per (path + query,
+# store version). Each variant has its own strong ETag ("<hash>", "<hash>-gz",
+# "<hash>-br"), since their bytes differ. A hit skips model validation and JSON encoding;
+# If-None-Match on the negotiated variant gets a 304. A store refresh bumps the version
+# and retires the entry.
+# Hits still count as reads of the store key (store.touch), so it stays on the refresh
+# schedule and a stale entry is revalidated behind the cached response.
+RESPONSE_CACHE_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))  # day windows roll over
+MIN_COMPRESS_BYTES = 512
+_CODINGS = (("br", "-br"), ("gzip", "-gz"), ("identity", ""))  # server preference on equal q; ETag suffix
+
+_ENTRIES = LRUCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+metrics.register_cache("responses", _ENTRIES.stats)
+
+def cache_key(request: Request) -> str:
+    return request.url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+
+def _build_entry(body: bytes, media_type: str) -> Dict:
+    return {
+        "media_type": media_type,
+        "tag": hashlib.sha1(body).hexdigest()[:24],
+        "identity": body,
+        "gzip": gzip.compress(body, 6) if len(body) >= MIN_COMPRESS_BYTES else None,
+        "br": brotli.compress(body, quality=5) if brotli and len(body) >= MIN_COMPRESS_BYTES else None,
+    }
+
+def stats() -> Dict[str, int]:
+    return _ENTRIES.stats()
+
+def _qvalues(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; malformed elements are ignored."""
+    prefs: Dict[str, float] = {}
+    for part in header.lower().split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            k, _, v = param.partition("=")
+            if k.strip() == "q":
+                try:
+                    q = min(1.0, max(0.0, float(v)))
+                except ValueError:
+                    q = -1.0
+        if q >= 0:
+            prefs["gzip" if name == "x-gzip" else name] = q
+    return prefs
+
+def _negotiate(request: Request, e: Dict) -> str:
+    """
+    The content-coding to send: the highest q among the variants we have (ties go to
+    br, gzip, identity). Codings not listed take the q of "*", or are unacceptable;
+    identity, when neither it nor "*" is listed, is only the fallback.
+    """
+    header = request.headers.get("accept-encoding")
+    if not header:
+        return "identity"
+    prefs = _qvalues(header)
+    best, best_q = "identity", 0.0
+    for coding, _ in _CODINGS:
+        if e[coding] is None:
+            continue
+        q = prefs.get(coding, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def _send(request: Request, e: Dict) -> Response:
+    coding = _negotiate(request, e)
+    etag = '"' + e["tag"] + dict(_CODINGS)[coding] + '"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    inm = request.headers.get("if-none-match", "")
+    if inm and (inm.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in inm.split(",")]):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=e[coding], media_type=e["media_type"], headers=headers)
+
+def _encode(payload: Any) -> bytes:
+    if isinstance(payload, str):
+        return payload.encode("utf-8")
+    if isinstance(payload, bytes):
+        return payload
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+def _store(key: str, version: int, payload: Any, media_type: str) -> Dict:
+    with trace.span("serialize"):
+        e = _build_entry(_encode(payload), media_type)
+    _ENTRIES.put(key, e, version, size=sum(len(e[c] or b"") for c in ("identity", "gzip", "br")))
+    return e
+
+def _built(key: str, skey: str, before: int, payload: Any, media_type: str) -> Dict:
+    """
+    Entry for a payload built while `skey` was at version `before`. It is cached under the
+    version the build read: the current one, which a build on a never-loaded key loaded
+    itself. It is not cached when a refresh landed mid-build (either version may be in it).
+    """
+    after = store.version(skey)
+    if before and after != before:
+        with trace.span("serialize"):
+            return _build_entry(_encode(payload), media_type)
+    return _store(key, after, payload, media_type)
+
+def respond(request: Request, skey: str, build: Callable[[], Any],
+            media_type: str = "application/json") -> Response:
+    """
+    Serve `build()` through the cache. `build` returns a JSON-able object or raw bytes/str
+    derived from store key `skey`; entries are kept per version of that key.
+    """
+    key, version = cache_key(request), store.version(skey)
+    e = _ENTRIES.get(key, version)
+    if e is None:
+        e = _built(key, skey, version, build(), media_type)
+    else:
+        store.touch(skey)
+    return _send(request, e)
+
+async def respond_async(request: Request, skey: str, build: Callable[[], Any],
+                        media_type: str = "application/json") -> Response:
+    """respond() for async routes: hits never leave the event loop, a miss builds in the threadpool."""
+    key, version = cache_key(request), store.version(skey)
+    e = _ENTRIES.get(key, version)
+    if e is None:
+        e = _built(key, skey, version, await run_in_threadpool(build), media_type)
+    else:
+        store.touch(skey)
+    return _send(request, e)
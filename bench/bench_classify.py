@@ -0,0 +1,43 @@
+"""
+Category + stance classification throughput on full-article-sized texts.
+Run from the repo root:  python -m bench.bench_classify [--ref <git-rev>]
+"""
+import argparse, subprocess, time, types
+from bench import corpus
+from backend.aggregator import classify
+from backend.aggregator.utils import text_contains_any
+
+def _load_ref(rev: str):
+    src = subprocess.check_output(["git", "show", f"{rev}:backend/aggregator/classify.py"])
+    mod = types.ModuleType("classify_ref")
+    mod.__package__ = "backend.aggregator"
+    exec(compile(src, f"classify@{rev}", "exec"), mod.__dict__)
+    return mod
+
+def _time(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ref", help="git revision to compare against")
+    ap.add_argument("-n", type=int, default=500)
+    args = ap.parse_args()
+    texts = [x for _, x in corpus.articles(args.n, (30, 80))]
+
+    if args.ref:
+        ref = _load_ref(args.ref)
+        t = _time(lambda: [ref.stance_for_state_politics(x, "Delhi") for x in texts])
+        print(f"{args.ref:>12} stance          : {args.n / t:8.0f} docs/s")
+        same = all(ref.stance_for_state_politics(x, "Delhi") == classify.stance_for_state_politics(x, "Delhi") for x in texts)
+        print(f"{'':>12} identical output: {same}")
+    t = _time(lambda: [classify.stance_for_state_politics(x, "Delhi") for x in texts])
+    print(f"{'now':>12} stance          : {args.n / t:8.0f} docs/s")
+    t = _time(lambda: [[text_contains_any(x, k) for k in classify.CATEGORY_KEYWORDS.values()] for x in texts])
+    print(f"{'now':>12} 6x contains_any : {args.n / t:8.0f} docs/s")
+    t = _time(lambda: [classify.category_scores(x) for x in texts])
+    print(f"{'now':>12} category_scores : {args.n / t:8.0f} docs/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Cold-cache feed fetching: sequential vs concurrent, against the local fixture server.
+Run from the repo root:  python -m bench.bench_fetch
+"""
+import os, time
+os.environ.setdefault("SHARED_STORE", "0")  # "cold" must not adopt another process's store snapshot
+from bench import fixture_server
+from backend.aggregator import aio, fetch, feeds, sources, store
+
+DELAYS = [0.2, 0.4, 0.6, 0.8, 1.0]
+
+def main():
+    srv = fixture_server.start()
+    base = "http://%s:%d" % srv.server_address
+    urls = [f"{base}/feed/pub{i}.xml?delay={d}" for i, d in enumerate(DELAYS)]
+
+    t0 = time.perf_counter()
+    for u in urls:
+        aio.run(feeds._fetch_feed(u))
+    seq = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    feeds.fetch_feeds(urls)
+    conc = time.perf_counter() - t0
+
+    big = [f"{base}/feed/big{i}.xml?items=400" for i in range(5)]
+    feeds._VALIDATORS.clear()
+    t0 = time.perf_counter()
+    feeds.fetch_feeds(big)
+    full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    feeds.fetch_feeds(big)
+    revalidated = time.perf_counter() - t0
+
+    sources.NATIONAL_FEEDS[:] = urls
+    fetch._CACHE.clear()
+    feeds._VALIDATORS.clear()
+    store._STORE.clear()
+    t0 = time.perf_counter()
+    items = fetch.get_news("national", None, None, 2, 200)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fetch.get_news("national", None, "politics", 7, 150)
+    fetch.get_news("national", None, None, 14, 60)
+    other = time.perf_counter() - t0
+
+    hung = urls + [f"{base}/feed/hung.xml?delay=30"]
+    t0 = time.perf_counter()
+    got = feeds.fetch_feeds(hung, deadline=2.0)
+    bounded = time.perf_counter() - t0
+
+    print(f"feed delays        : {DELAYS} (sum {sum(DELAYS):.1f}s, max {max(DELAYS):.1f}s)")
+    print(f"sequential download: {seq:.2f}s")
+    print(f"concurrent download: {conc:.2f}s")
+    print(f"5x400-item refetch : {full:.2f}s full, {revalidated:.3f}s via 304")
+    print(f"get_news cold      : {cold:.2f}s ({len(items)} items)")
+    print(f"2 more param sets  : {other:.3f}s (served from the item store)")
+    print(f"with a hung feed   : {bounded:.2f}s ({sum(v is not None for v in got.values())}/{len(hung)} feeds, 2s deadline)")
+    srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Summarizer throughput on a synthetic corpus.
+Run from the repo root:  python -m bench.bench_summarize [--ref <git-rev>]
+--ref also times summarize_rule_based as it was at that revision and checks outputs match.
+"""
+import argparse, subprocess, time, types
+from bench import corpus
+from backend.aggregator import summarize
+
+def _load_ref(rev: str):
+    src = subprocess.check_output(["git", "show", f"{rev}:backend/aggregator/summarize.py"])
+    mod = types.ModuleType("summarize_ref")
+    exec(compile(src, f"summarize@{rev}", "exec"), mod.__dict__)
+    return mod
+
+def _rate(fn, docs) -> float:
+    t0 = time.perf_counter()
+    fn(docs)
+    return len(docs) / (time.perf_counter() - t0)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ref", help="git revision to compare against")
+    ap.add_argument("-n", type=int, default=2000)
+    args = ap.parse_args()
+
+    docs = corpus.articles(args.n)
+    if args.ref:
+        ref = _load_ref(args.ref)
+        r = _rate(lambda d: [ref.summarize_rule_based(t, x, 900) for t, x in d], docs)
+        print(f"{args.ref:>12} per-item      : {r:9.0f} items/s")
+        summarize._MEMO.clear()
+        same = all(ref.summarize_rule_based(t, x, 900) == summarize.summarize_rule_based(t, x, 900) for t, x in docs)
+        print(f"{'':>12} identical output: {same}")
+
+    summarize._MEMO.clear()
+    print(f"{'now':>12} per-item cold : {_rate(lambda d: [summarize._summarize(t, x, 900) for t, x in d], docs):9.0f} items/s")
+    summarize._MEMO.clear()
+    print(f"{'now':>12} batch cold    : {_rate(lambda d: summarize.summarize_batch(d, 900), docs):9.0f} items/s")
+    print(f"{'now':>12} batch memo hit: {_rate(lambda d: summarize.summarize_batch(d, 900), docs):9.0f} items/s")
+
+if __name__ == "__main__":
+    main()
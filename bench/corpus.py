@@ -0,0 +1,33 @@
+"""Deterministic synthetic news corpus shared by the benchmarks (no network, no recorded data needed)."""
+import random
+from typing import List, Tuple
+
+_SUBJECTS = ["The state government", "The Chief Minister", "Officials", "The RBI", "ISRO", "The Supreme Court",
+             "The opposition", "Police", "The university", "The cricket board", "Investors", "The ministry"]
+_VERBS = ["announced", "launched", "approved", "criticised", "rolled out", "said", "stated", "reviewed",
+          "inaugurated", "probed", "sanctioned", "delayed"]
+_OBJECTS = ["a new scheme for farmers", "the metro rail project", "exam results for class 12",
+            "a satellite mission", "the repo rate", "a relief package", "the IPL auction",
+            "a corruption probe", "the budget allocation", "an AI research lab", "the film festival",
+            "flood relief funds"]
+_PLACES = ["Hyderabad", "Lucknow", "Chennai", "Patna", "Pune", "Guwahati", "Jaipur", "Kochi", "Bhopal",
+           "Kolkata", "Delhi", "Bengaluru", "Ranchi", "Shimla", "Surat", "Nagpur"]
+_TAILS = ["on Monday", "according to sources", "amid protests", "in the Assembly", "after a cabinet meeting",
+          "officials added", "in a statement", "ahead of the election", ""]
+
+def sentence(rng: random.Random) -> str:
+    s = (f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} in {rng.choice(_PLACES)} "
+         f"worth Rs {rng.randint(2, 9999)} crore {rng.choice(_TAILS)}").strip()
+    if rng.random() < 0.4:
+        s += f", and {rng.choice(_SUBJECTS).lower()} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}"
+    return s + "."
+
+def articles(n: int = 500, sentences: Tuple[int, int] = (4, 40), seed: int = 7) -> List[Tuple[str, str]]:
+    """n (title, text) pairs; text length varies from RSS-blurb to full-article size."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        title = sentence(rng).rstrip(".")
+        body = " ".join(sentence(rng) for _ in range(rng.randint(*sentences)))
+        out.append((title, f"<p>{body}</p>"))
+    return out
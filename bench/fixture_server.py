@@ -0,0 +1,152 @@
+"""
+Local stand-in for the RSS publishers, used by the benchmarks.
+GET /feed/<name>.xml?delay=0.5&items=60  -> RSS 2.0 with <items> recent entries after <delay> s
+    &sentences=6     description length per item (payload size)
+    &error=0.25      answer that share of requests with a 500 (deterministic per path)
+    &status=503      always answer with this status
+    &links=local     item links point at /article/... on this server (deep mode)
+GET /article/<name>/<i>.html?delay=&paragraphs=12  -> article page for item <i>
+If bench/fixtures/<name>.xml exists it is served instead of a synthetic feed (recorded
+publisher feeds: RSS 2.0, Atom, RDF and a malformed one). Their dates are shifted so the
+newest is now, spacing and format kept; &links=local points their links at /article/<name>/.
+If bench/fixtures/articles/<name>.html exists it is the page for every item of <name>.
+GET /gita/slok/<chapter>/<verse>/  -> a verse as JSON, shaped like bhagavadgitaapi.in
+Every feed carries a stable ETag and answers If-None-Match with 304.
+Every 5th item is a shared "wire" story: the same text appears in every feed.
+"""
+import datetime as dt
+import hashlib, json, os, random, re, threading, time
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from bench import corpus
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+_HITS = {}  # path -> request count, for the deterministic error rate
+_HITS_LOCK = threading.Lock()
+
+def make_rss(name: str, items: int = 60, sentences: int = 6, link_base: str = "http://fixture.invalid") -> bytes:
+    now = dt.datetime.now(dt.timezone.utc)
+    out = [f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{name}</title>']
+    for i in range(items):
+        pub = format_datetime(now - dt.timedelta(minutes=37 * i))
+        wire = i % 5 == 0
+        rng = random.Random(f"wire-{i}" if wire else f"{name}-{i}")
+        title = corpus.sentence(rng).rstrip(".")
+        body = " ".join(corpus.sentence(rng) for _ in range(sentences))
+        out.append(
+            f"<item><title>{name} story {i}: {title}</title><link>{link_base}/{name}/{i}?utm=x</link>"
+            f"<pubDate>{pub}</pubDate><description><![CDATA[<p>{body}</p>]]></description></item>"
+        )
+    out.append("</channel></rss>")
+    return "".join(out).encode("utf-8")
+
+def make_article(name: str, i: int, paragraphs: int = 12) -> bytes:
+    rng = random.Random(f"wire-{i}" if i % 5 == 0 else f"{name}-{i}")
+    title = corpus.sentence(rng).rstrip(".")
+    paras = "".join(f"<p>{' '.join(corpus.sentence(rng) for _ in range(4))}</p>" for _ in range(paragraphs))
+    return (f"<!doctype html><html><head><title>{title}</title></head><body><nav>Home | News</nav>"
+            f"<article><h1>{title}</h1>{paras}</article><footer>(c) {name}</footer></body></html>").encode("utf-8")
+
+_DATE_RE = re.compile(rb"<(pubDate|published|updated|dc:date|lastBuildDate)>([^<]+)</\1>")
+_LINK_RE = re.compile(rb"(<link>)[^<]+(</link>)|(<link\b[^>]*?\bhref=\")[^\"]+(\")")
+
+def _recorded_date(s: str):
+    """(datetime, is_rfc822) or None."""
+    try:
+        return parsedate_to_datetime(s), True
+    except (TypeError, ValueError, IndexError):
+        try:
+            return dt.datetime.fromisoformat(s.strip()), False
+        except ValueError:
+            return None
+
+def rebase_dates(body: bytes) -> bytes:
+    """Shift every date of a recorded feed so the newest is now; spacing and format are kept."""
+    found = [_recorded_date(m.group(2).decode()) for m in _DATE_RE.finditer(body)]
+    dates = [d for d, _ in filter(None, found)]
+    if not dates:
+        return body
+    shift = dt.timedelta(seconds=int((dt.datetime.now(dt.timezone.utc) - max(dates)).total_seconds()))
+    def sub(m):
+        parsed = _recorded_date(m.group(2).decode())
+        if parsed is None:
+            return m.group(0)
+        d, rfc = parsed
+        text = format_datetime(d + shift) if rfc else (d + shift).isoformat()
+        return b"<%s>%s</%s>" % (m.group(1), text.encode(), m.group(1))
+    return _DATE_RE.sub(sub, body)
+
+def localize_links(body: bytes, base: str) -> bytes:
+    """Point every link of a recorded feed at <base>/<n>.html (n counts links)."""
+    n = iter(range(1 << 30))
+    def sub(m):
+        url = f"{base}/{next(n)}.html".encode()
+        return m.group(1) + url + m.group(2) if m.group(1) else m.group(3) + url + m.group(4)
+    return _LINK_RE.sub(sub, body)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like real publishers
+
+    def _send(self, status: int, body: bytes = b"", ctype: str = "text/plain", etag: str = ""):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        q = parse_qs(u.query)
+        arg = lambda k, d: q.get(k, [d])[0]
+        time.sleep(float(arg("delay", "0")))
+        if arg("status", ""):
+            return self._send(int(arg("status", "500")), b"fixture error")
+        rate = float(arg("error", "0"))
+        if rate > 0:
+            with _HITS_LOCK:
+                n = _HITS[self.path] = _HITS.get(self.path, 0) + 1
+            if int(n * rate) != int((n - 1) * rate):  # every 1/rate-th request
+                return self._send(500, b"fixture error")
+
+        parts = u.path.strip("/").split("/")
+        if parts[:2] == ["gita", "slok"] and len(parts) == 4:
+            rng = random.Random(u.path)
+            verse = {"chapter": int(parts[2]), "verse": int(parts[3]), "slok": corpus.sentence(rng),
+                     "et": corpus.sentence(rng)}
+            return self._send(200, json.dumps(verse).encode(), "application/json")
+        if parts[0] == "article" and len(parts) == 3:
+            recorded = os.path.join(FIXTURES_DIR, "articles", f"{parts[1]}.html")
+            if os.path.exists(recorded):
+                with open(recorded, "rb") as f:
+                    return self._send(200, f.read(), "text/html; charset=utf-8")
+            i = int(parts[2].split(".", 1)[0])
+            return self._send(200, make_article(parts[1], i, int(arg("paragraphs", "12"))), "text/html; charset=utf-8")
+
+        name = u.path.rsplit("/", 1)[-1].split(".", 1)[0] or "feed"
+        etag = '"%s"' % hashlib.md5(self.path.encode()).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, etag=etag)
+        recorded = os.path.join(FIXTURES_DIR, f"{name}.xml")
+        local = arg("links", "") == "local"
+        if os.path.exists(recorded):
+            with open(recorded, "rb") as f:
+                body = rebase_dates(f.read())
+            if local:
+                body = localize_links(body, f"http://{self.headers.get('Host')}/article/{name}")
+        else:
+            link_base = f"http://{self.headers.get('Host')}/article" if local else "http://fixture.invalid"
+            body = make_rss(name, int(arg("items", "60")), int(arg("sentences", "6")), link_base)
+        self._send(200, body, "application/rss+xml; charset=utf-8", etag)
+
+    def log_message(self, *args):
+        pass
+
+def start(port: int = 0) -> ThreadingHTTPServer:
+    """Start the fixture server on a daemon thread; returns it (base URL via server_address)."""
+    srv = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
@@ -0,0 +1,243 @@
+"""
+Load test: many simulated users replaying the frontend's traffic mix (frontend/assets/app.js)
+against a real uvicorn server whose feeds come from the local fixture server.
+Run from the repo root:
+    python -m bench.loadtest [--users 50] [--duration 60] [--workers 1] [--think 2] [--json out.json]
+Reports throughput and p50/p95/p99 per endpoint, plus a per-interval timeline of req/s,
+tail latency, threadpool use (from /metrics) and the server's RSS (all its processes).
+With --workers > 1 each /metrics scrape sees one worker, so threadpool numbers are a sample.
+/api/chat calls Gemini and is only in the mix with --chat (needs GEMINI_API_KEY on the server).
+Linux only (RSS is read from /proc).
+"""
+import argparse, asyncio, json, os, random, socket, subprocess, sys, tempfile, time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from bench import fixture_server
+
+# (weight, label, method, path, params) for one user interaction after the page load
+CATEGORIES = ["", "politics", "sports", "education", "science", "business", "entertainment"]
+SEARCHES = ["metro", "ISRO", "RBI", "farmers", "budget", "Hyderabad", "flood relief", "IPL"]
+FOLLOWS = ["ISRO,RBI", "metro,Pune", "budget", "farmers,flood relief,Patna"]
+PAGE_LOAD = [("top5", "/api/signals/top5", {"days": "2"}),
+             ("news", "/api/news", {"scope": "national", "days": "2", "limit": "60", "fetch_mode": "light"}),
+             ("shloka", "/api/shloka/daily", {})]
+
+def _interaction(rng: random.Random, chat: bool) -> Tuple[str, str, str, Optional[Dict]]:
+    """(label, method, path, params or json body) for a user's next action, weighted like the UI."""
+    mix = [(30, "news"), (20, "search"), (15, "curated"), (10, "digest"), (10, "top5"), (5, "shloka")]
+    if chat:
+        mix.append((5, "chat"))
+    label = rng.choices([m[1] for m in mix], [m[0] for m in mix])[0]
+    if label == "news":
+        p = {"scope": "national", "days": rng.choice(["1", "2", "3", "5", "7"]), "limit": "60", "fetch_mode": "light"}
+        if rng.random() < 0.7:
+            p["category"] = rng.choice(CATEGORIES)
+        return label, "GET", "/api/news", p
+    if label == "search":
+        return label, "GET", "/api/search", {"q": rng.choice(SEARCHES), "days": "7"}
+    if label == "curated":
+        return label, "GET", "/api/curated", {"topic": rng.choice(["finance", "startup", "ai"]), "days": "3"}
+    if label == "digest":
+        return label, "GET", "/api/digest", {"follow": rng.choice(FOLLOWS), "days": "2"}
+    if label == "top5":
+        return label, "GET", "/api/signals/top5", {"days": "2"}
+    if label == "chat":
+        return label, "POST", "/api/chat", {"message": "Summarise today's top story in two lines."}
+    return label, "GET", "/api/shloka/daily", {}
+
+# ---------- server under test ----------
+def __getattr__(name: str):
+    """
+    `uvicorn bench.loadtest:app`: the real app, with its feeds and the shloka API pointed
+    at LOADTEST_FIXTURE_BASE (no traffic leaves the machine).
+    """
+    if name != "app":
+        raise AttributeError(name)
+    from bench.suite import configure_feeds
+    base = os.environ["LOADTEST_FIXTURE_BASE"]
+    configure_feeds(base)
+    from backend import app as server
+    server.SHLOKA_API_BASE = base + "/gita"
+    return server.app
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _start_server(port: int, workers: int, fixture_base: str) -> subprocess.Popen:
+    env = dict(os.environ, LOADTEST_FIXTURE_BASE=fixture_base,
+               NL_STORE_PATH=os.path.join(tempfile.mkdtemp(prefix="nl-load-"), "store.sqlite3"))
+    env.setdefault("SHARED_STORE", "1" if workers > 1 else "0")
+    return subprocess.Popen([sys.executable, "-m", "uvicorn", "bench.loadtest:app", "--host", "127.0.0.1",
+                             "--port", str(port), "--workers", str(workers), "--log-level", "warning"], env=env)
+
+def _tree_rss_mb(pid: int) -> float:
+    """Resident memory of `pid` and its descendants (uvicorn workers), from /proc."""
+    parents: Dict[int, int] = {}
+    for d in os.listdir("/proc"):
+        if d.isdigit():
+            try:
+                with open(f"/proc/{d}/stat") as f:
+                    parents[int(d)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+    tree, frontier = {pid}, [pid]
+    while frontier:
+        p = frontier.pop()
+        kids = [c for c, pp in parents.items() if pp == p and c not in tree]
+        tree.update(kids)
+        frontier += kids
+    kb = 0
+    for p in tree:
+        try:
+            with open(f"/proc/{p}/status") as f:
+                kb += next((int(l.split()[1]) for l in f if l.startswith("VmRSS:")), 0)
+        except OSError:
+            continue
+    return kb / 1024
+
+# ---------- load ----------
+class Recorder:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.samples: List[Tuple[float, str, float, int]] = []  # (done at, label, seconds, status)
+        self.timeline: List[Dict[str, float]] = []
+
+    def add(self, label: str, seconds: float, status: int):
+        self.samples.append((time.perf_counter() - self.t0, label, seconds, status))
+
+async def _request(client: httpx.AsyncClient, rec: Recorder, label: str, method: str, path: str, params: Optional[Dict]):
+    t0 = time.perf_counter()
+    try:
+        if method == "POST":
+            r = await client.post(path, json=params)
+        else:
+            r = await client.get(path, params=params)
+        status = r.status_code
+    except httpx.HTTPError:
+        status = 0
+    rec.add(label, time.perf_counter() - t0, status)
+
+async def _user(client: httpx.AsyncClient, rec: Recorder, seed: int, start_in: float, deadline: float,
+                think: float, chat: bool):
+    rng = random.Random(seed)
+    await asyncio.sleep(start_in)
+    # page load: the UI fires these together
+    await asyncio.gather(*(_request(client, rec, label, "GET", path, params) for label, path, params in PAGE_LOAD))
+    while True:
+        await asyncio.sleep(rng.expovariate(1 / think) if think > 0 else 0)
+        if time.perf_counter() >= deadline:
+            return
+        await _request(client, rec, *_interaction(rng, chat))
+
+def _scrape_threadpool(text: str) -> Dict[str, float]:
+    out = {}
+    for line in text.splitlines():
+        if line.startswith("newslens_threadpool_"):
+            name, value = line.rsplit(" ", 1)
+            out[name[len("newslens_threadpool_"):]] = float(value)
+    return out
+
+async def _sampler(base: str, pid: int, rec: Recorder, interval: float, deadline: float):
+    async with httpx.AsyncClient(base_url=base, timeout=5) as c:
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(interval)
+            row = {"t": round(time.perf_counter() - rec.t0, 1), "rss_mb": round(_tree_rss_mb(pid), 1)}
+            try:
+                row.update(_scrape_threadpool((await c.get("/metrics")).text))
+            except httpx.HTTPError:
+                pass
+            rec.timeline.append(row)
+
+async def _run(base: str, pid: int, args) -> Recorder:
+    rec = Recorder()
+    deadline = time.perf_counter() + args.duration
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base, timeout=args.timeout, limits=limits) as client:
+        users = [_user(client, rec, i, args.ramp * i / args.users, deadline, args.think, args.chat)
+                 for i in range(args.users)]
+        await asyncio.gather(_sampler(base, pid, rec, args.interval, deadline), *users)
+    return rec
+
+# ---------- report ----------
+def _pct(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+def _summary(samples) -> Dict[str, float]:
+    lat = sorted(s[2] for s in samples)
+    return {"n": len(lat), "errors": sum(1 for s in samples if not 200 <= s[3] < 400),
+            "p50_ms": round(_pct(lat, 0.50) * 1000, 1), "p95_ms": round(_pct(lat, 0.95) * 1000, 1),
+            "p99_ms": round(_pct(lat, 0.99) * 1000, 1), "max_ms": round((lat[-1] if lat else 0) * 1000, 1)}
+
+def report(rec: Recorder, duration: float, interval: float) -> Dict:
+    labels = sorted({s[1] for s in rec.samples})
+    out = {"throughput_rps": round(len(rec.samples) / duration, 1), "all": _summary(rec.samples),
+           "endpoints": {l: _summary([s for s in rec.samples if s[1] == l]) for l in labels}, "timeline": []}
+    print(f"\n{'endpoint':<10}{'n':>7}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for l, r in list(out["endpoints"].items()) + [("ALL", out["all"])]:
+        print(f"{l:<10}{r['n']:>7}{r['errors']:>6}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}")
+    print(f"\nthroughput {out['throughput_rps']} req/s over {duration:.0f}s")
+
+    print(f"\n{'t s':>6}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'busy':>6}{'size':>6}{'queued':>8}{'rss MB':>9}")
+    prev = 0.0
+    for row in rec.timeline:
+        window = [s for s in rec.samples if prev < s[0] <= row["t"]]
+        lat = sorted(s[2] for s in window)
+        r = dict(row, rps=round(len(window) / interval, 1), p50_ms=round(_pct(lat, 0.5) * 1000, 1),
+                 p99_ms=round(_pct(lat, 0.99) * 1000, 1))
+        out["timeline"].append(r)
+        print(f"{r['t']:>6}{r['rps']:>8}{r['p50_ms']:>9}{r['p99_ms']:>9}{r.get('busy', 0):>6g}{r.get('size', 0):>6g}"
+              f"{r.get('waiting', 0):>8g}{r['rss_mb']:>9}")
+        prev = row["t"]
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--duration", type=float, default=60, help="seconds of load")
+    ap.add_argument("--ramp", type=float, default=5, help="seconds over which users arrive")
+    ap.add_argument("--think", type=float, default=2, help="mean think time between a user's actions (s)")
+    ap.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    ap.add_argument("--interval", type=float, default=2, help="timeline sample interval (s)")
+    ap.add_argument("--timeout", type=float, default=30, help="per-request timeout (s)")
+    ap.add_argument("--cold", action="store_true", help="don't warm the store before the clock starts")
+    ap.add_argument("--chat", action="store_true", help="include /api/chat (calls Gemini)")
+    ap.add_argument("--json", help="write the report as JSON")
+    args = ap.parse_args()
+
+    srv = fixture_server.start()
+    port = _free_port()
+    proc = _start_server(port, args.workers, "http://%s:%d" % srv.server_address)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                if httpx.get(base + "/healthz", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise SystemExit("server did not come up")
+        if not args.cold:
+            for path in ["/api/news?days=7", "/api/curated?topic=finance", "/api/curated?topic=startup",
+                         "/api/curated?topic=ai", "/api/shloka/daily"]:
+                httpx.get(base + path, timeout=args.timeout)
+        print(f"{args.users} users, {args.workers} worker(s), think {args.think}s, {args.duration:.0f}s ...")
+        rec = asyncio.run(_run(base, proc.pid, args))
+        out = report(rec, args.duration, args.interval)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(dict(out, args=vars(args)), f, indent=2)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Offline benchmark suite: drives the aggregator and the FastAPI endpoints against the
+local fixture server and reports cold/warm latency, items/s and peak memory.
+Run from the repo root:
+    python -m bench.suite                          # print results
+    python -m bench.suite --save bench/baseline.json
+    python -m bench.suite --compare bench/baseline.json [--tolerance 0.25] [--repeat 3]
+Each metric is the best of --repeat runs. --compare exits 1 when one regressed by more
+than the tolerance (and a small absolute noise floor), so it can gate a deploy.
+"""
+import os
+# cold must mean cold: no persisted summaries/articles, no shared store snapshots, no scheduler
+os.environ.setdefault("PERSIST_ENABLED", "0")
+os.environ.setdefault("SHARED_STORE", "0")
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+
+import argparse, importlib.util, json, random, statistics, sys, time, tracemalloc
+from typing import Callable, Dict, List
+
+from bench import corpus, fixture_server
+from backend.aggregator import cluster, curated, feeds, fetch, sources, store, summarize
+
+# (name, delay s, items, description sentences); one feed always fails, one fails every 4th call
+NATIONAL = [("pti", 0.05, 80, 6), ("ht", 0.1, 60, 8), ("toi", 0.15, 100, 4), ("ie", 0.2, 60, 10),
+            ("hindu", 0.25, 40, 12), ("ndtv", 0.3, 60, 6)]
+FLAKY = ("flaky", 0.1, 60, 6, "error=0.25")
+BROKEN = ("broken", 0.05, 0, 0, "status=503")
+CURATED = {"finance": [("mint", 0.1, 80, 8), ("bs", 0.2, 60, 6)],
+           "startup": [("inc42", 0.1, 40, 10)],
+           "ai": [("aiwire", 0.15, 50, 8)]}
+# recorded publisher feeds (bench/fixtures): RSS 2.0, Atom, RDF and a malformed one that
+# takes the feedparser fallback. They join the national set and make up RECORDED_STATE,
+# whose deep mode extracts the recorded article pages.
+RECORDED = [("rec-rss2", 0.1), ("rec-atom", 0.15), ("rec-rdf", 0.2), ("rec-malformed", 0.05)]
+RECORDED_STATE = "Telangana"
+DEEP_ITEMS = 10
+WARM_RUNS = 30
+# cluster scenario: a store window of CLUSTER_WINDOW records; each warm run is a refresh
+# that slides it by CLUSTER_NEW new stories (and drops as many old ones)
+CLUSTER_WINDOW, CLUSTER_NEW = 600, 30
+
+def _url(base: str, name: str, delay: float, items: int, sentences: int, extra: str = "") -> str:
+    return f"{base}/feed/{name}.xml?delay={delay}&items={items}&sentences={sentences}" + (f"&{extra}" if extra else "")
+
+def configure_feeds(base: str):
+    """Point the national, RECORDED_STATE and curated source lists at the fixture server at `base`."""
+    recorded = [f"{base}/feed/{name}.xml?delay={delay}&links=local" for name, delay in RECORDED]
+    sources.NATIONAL_FEEDS[:] = [_url(base, *f) for f in NATIONAL + [FLAKY, BROKEN]] + recorded
+    sources.STATE_FEEDS[RECORDED_STATE] = recorded
+    for topic, fs in CURATED.items():
+        sources.CURATED_FEEDS[topic] = [_url(base, *f) for f in fs]
+
+def _reset():
+    """Forget everything learned in-process so the next call is a true cold start."""
+    store._STORE.clear()
+    fetch._CACHE.clear()
+    feeds._VALIDATORS.clear()
+    feeds._BREAKER.clear()
+    summarize._MEMO.clear()
+    cluster._STATES.clear()
+    from backend import respcache
+    respcache._ENTRIES.clear()
+
+def _cluster_pool(n: int) -> List[Dict]:
+    """Records as the national feeds produce them, newest first: every 5th story is the wire copy."""
+    out = []
+    for i in range(n):
+        name, _, _, sentences = NATIONAL[i % len(NATIONAL)]
+        story = i // len(NATIONAL)
+        rng = random.Random(f"wire-{story}" if story % 5 == 0 else f"{name}-{story}")
+        title = corpus.sentence(rng).rstrip(".")
+        desc = " ".join(corpus.sentence(rng) for _ in range(sentences))
+        out.append({"title": title, "desc": desc, "item": {"source": name, "url": f"http://bench/{name}/{story}"}})
+    return out
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    _reset()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+def _once(cold: Callable[[], int], warm: Callable[[], object]):
+    _reset()
+    t0 = time.perf_counter()
+    items = cold()
+    cold_s = time.perf_counter() - t0
+    lat = []
+    for _ in range(WARM_RUNS):
+        t0 = time.perf_counter()
+        warm()
+        lat.append(time.perf_counter() - t0)
+    return cold_s, statistics.median(lat), items
+
+def _scenario(cold: Callable[[], int], warm: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """cold() returns the number of items it produced; warm() is repeated on the loaded state."""
+    runs = [_once(cold, warm) for _ in range(repeat)]
+    cold_s = min(r[0] for r in runs)
+    items = runs[-1][2]
+    return {
+        "cold_s": round(cold_s, 3),
+        "warm_p50_ms": round(min(r[1] for r in runs) * 1000, 3),
+        "items": items,
+        "items_per_s": round(items / cold_s, 1) if cold_s else 0.0,
+        "peak_mb": round(_peak_mb(cold), 2),
+    }
+
+def run(repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    srv = fixture_server.start()
+    configure_feeds("http://%s:%d" % srv.server_address)
+
+    from fastapi.testclient import TestClient
+    from backend.app import app
+    client = TestClient(app)
+
+    def national_items() -> int:
+        fetch.get_news("national", None, None, 2, 60)
+        return len(store.get_records(store.store_key("national")))
+
+    def curated_items() -> int:
+        return sum(len(curated.get_curated(t, 14, 200)) for t in CURATED)
+
+    def endpoint(path: str) -> Callable[[], int]:
+        def go() -> int:
+            r = client.get(path)
+            r.raise_for_status()
+            return len(r.json().get("items") or r.json().get("terms") or []) if "json" in r.headers["content-type"] else 1
+        return go
+
+    docs = corpus.articles(2000)
+    pool = _cluster_pool(CLUSTER_WINDOW + CLUSTER_NEW * WARM_RUNS)
+    window = {"start": 0}
+
+    def cluster_cold() -> int:
+        window["start"] = 0
+        return len(cluster.cluster_records(pool[:CLUSTER_WINDOW], key="bench"))
+
+    def cluster_refresh():
+        window["start"] += CLUSTER_NEW
+        start = window["start"]
+        return cluster.cluster_records(pool[start:start + CLUSTER_WINDOW], key="bench")
+
+    results = {
+        "get_news": _scenario(national_items, lambda: fetch.get_news("national", None, "politics", 7, 60), repeat),
+        "get_curated": _scenario(curated_items, lambda: curated.get_curated("finance", 3, 60), repeat),
+        "summarize_batch": _scenario(lambda: len(summarize.summarize_batch(docs, 900)),
+                                     lambda: summarize.summarize_batch(docs[:200], 900), repeat),
+        "cluster": _scenario(cluster_cold, cluster_refresh, repeat),
+    }
+    def recorded_items() -> int:
+        return len(fetch.get_news("state", RECORDED_STATE, None, 2, 60))
+
+    results["get_news recorded"] = _scenario(recorded_items, recorded_items, repeat)
+    if fetch.DEEP_MODE_ENABLED and importlib.util.find_spec("newspaper"):  # deep mode is optional
+        deep = lambda: len(fetch.get_news("state", RECORDED_STATE, None, 2, DEEP_ITEMS, "deep"))
+        results["get_news deep recorded"] = _scenario(deep, deep, repeat)
+    for name, path in [("GET /api/news", "/api/news?limit=60"), ("GET /api/trending", "/api/trending"),
+                       ("GET /api/signals/top5", "/api/signals/top5"), ("GET /feed/all.xml", "/feed/all.xml"),
+                       ("GET /api/search", "/api/search?q=metro")]:
+        results[name] = _scenario(endpoint(path), endpoint(path), repeat)
+    srv.shutdown()
+    return results
+
+LOWER_IS_BETTER = ("cold_s", "warm_p50_ms", "peak_mb")
+HIGHER_IS_BETTER = ("items_per_s",)
+NOISE_FLOOR = {"cold_s": 0.05, "warm_p50_ms": 1.0, "peak_mb": 0.5, "items_per_s": 0.0}  # ignore tiny absolute moves
+
+def compare(now: Dict, base: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    print(f"\n{'scenario':<24}{'metric':<14}{'baseline':>12}{'now':>12}{'change':>9}")
+    for scen, metrics in now.items():
+        for m in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            b, n = base.get(scen, {}).get(m), metrics.get(m)
+            if b is None or n is None or b == 0:
+                continue
+            change = (n - b) / b
+            worse = change > tolerance if m in LOWER_IS_BETTER else change < -tolerance
+            worse = worse and abs(n - b) > NOISE_FLOOR[m]
+            flag = "  REGRESSION" if worse else ""
+            print(f"{scen:<24}{m:<14}{b:>12}{n:>12}{change:>+9.0%}{flag}")
+            if worse:
+                regressions.append(f"{scen} {m}: {b} -> {n}")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--save", help="write results as JSON (new baseline)")
+    ap.add_argument("--compare", help="baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per scenario; the best one is reported")
+    args = ap.parse_args()
+
+    results = run(max(1, args.repeat))
+    print(f"{'scenario':<24}{'cold s':>9}{'warm p50 ms':>13}{'items':>7}{'items/s':>10}{'peak MB':>9}")
+    for scen, r in results.items():
+        print(f"{scen:<24}{r['cold_s']:>9.3f}{r['warm_p50_ms']:>13.3f}{r['items']:>7}{r['items_per_s']:>10.1f}{r['peak_mb']:>9.2f}")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nregressed:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
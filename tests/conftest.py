@@ -0,0 +1,7 @@
+import os, sys
+
+# keep tests hermetic: no SQLite persistence, no shared store snapshots, no background refresh
+os.environ.setdefault("PERSIST_ENABLED", "0")
+os.environ.setdefault("SHARED_STORE", "0")
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,50 @@
+import random
+
+from backend.aggregator import cluster
+
+def _record(words, i):
+    text = " ".join(words)
+    return {"title": "", "desc": text, "item": {"source": f"s{i}", "url": f"http://x/{i}"}}
+
+def _pairs(n_pairs: int, shift: int, length: int = 41):
+    """Pairs of word-shifted texts; bigram Jaccard = (length-1-shift) / (length-1+shift)."""
+    rng = random.Random(42)
+    records = []
+    for p in range(n_pairs):
+        words = [f"w{p}x{rng.randrange(10**9)}" for _ in range(length + shift)]
+        records += [_record(words[:length], 2 * p), _record(words[shift:], 2 * p + 1)]
+    return records
+
+def _merged(records) -> int:
+    return len(records) - len(cluster.cluster_records(records))
+
+def test_recall_at_the_threshold():
+    # shift 13 -> J = 27/53 ~ 0.51, just above CLUSTER_THRESHOLD = 0.5
+    assert cluster._jaccard(cluster._shingles(_pairs(1, 13)[0]["desc"]), cluster._shingles(_pairs(1, 13)[1]["desc"])) > 0.5
+    assert _merged(_pairs(300, 13)) >= 291  # >= 97% (S-curve: ~99%)
+
+def test_recall_well_above_the_threshold():
+    assert _merged(_pairs(300, 8)) == 300  # J = 0.67
+
+def test_no_merge_below_the_threshold():
+    assert _merged(_pairs(300, 15)) == 0  # J = 25/55 ~ 0.45: candidates, but the exact check rejects them
+
+def _shape(records):
+    return [(r["item"]["url"], [s["url"] for s in r["item"].get("sources", [])]) for r in records]
+
+def test_reclustering_a_key_matches_a_full_run(monkeypatch):
+    pool = _pairs(60, 8) + _pairs(60, 13)
+    for i, r in enumerate(pool):
+        r["item"]["url"] = f"http://x/{i}"
+    first, second = pool[:150], pool[30:200]
+    second[10] = dict(second[10], desc=second[10]["desc"] + " edited")  # a member of an existing cluster changes
+    assert _shape(cluster.cluster_records(first, key="t")) == _shape(cluster.cluster_records(first))
+
+    signed = []
+    real = cluster.signature
+    monkeypatch.setattr(cluster, "signature", lambda sh: signed.append(1) or real(sh))
+    again = cluster.cluster_records(second, key="t")
+    assert len(signed) == 51  # the 50 new records and the edited one
+    assert _shape(again) == _shape(cluster.cluster_records(second))
+    assert all("sources" not in r["item"] for r in pool)  # inputs untouched
+    cluster._STATES.pop("t")
@@ -0,0 +1,25 @@
+import threading, time
+
+from backend.aggregator import fetch
+from bench import fixture_server
+
+def test_article_downloads_are_polite_and_parse_on_the_pool(monkeypatch):
+    srv = fixture_server.start()
+    base = "http://%s:%d/article/alpha" % srv.server_address
+    parsed = []
+    def parse(url, html):
+        parsed.append(threading.current_thread().name)
+        return {"title": "", "text": html, "published_at": None}
+    monkeypatch.setattr(fetch, "DEEP_MODE_ENABLED", True)
+    monkeypatch.setattr(fetch, "DEEP_HOST_DELAY_SECONDS", 0.1)
+    monkeypatch.setattr(fetch, "_import_newspaper", lambda: None)  # newspaper3k is optional here
+    monkeypatch.setattr(fetch, "_parse_article", parse)
+    try:
+        urls = [f"{base}/{i}.html" for i in range(6)]
+        t0 = time.monotonic()
+        got = dict(fetch._extract_iter(urls, 10))
+        assert set(got) == set(urls) and all("<article>" in a["text"] for a in got.values())
+        assert time.monotonic() - t0 >= 5 * 0.1  # one host: starts are spaced by the politeness gap
+        assert all(name.startswith("article") for name in parsed)
+    finally:
+        srv.shutdown()
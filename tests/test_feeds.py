@@ -0,0 +1,61 @@
+import os
+
+import feedparser
+
+from backend.aggregator import aio, feeds, metrics
+from bench import fixture_server
+
+def _bytes(url: str) -> float:
+    return metrics.FEED_BYTES.values.get((url,), 0.0)
+
+def test_download_stops_once_the_parser_has_enough():
+    srv = fixture_server.start()
+    try:
+        url = "http://%s:%d/feed/huge.xml?items=3000&sentences=8" % srv.server_address
+        feed = aio.run(feeds._fetch_feed(url))
+        assert len(feed.entries) == feeds.FEED_MAX_ENTRIES
+        assert _bytes(url) < len(fixture_server.make_rss("huge", 3000, 8)) / 4
+    finally:
+        srv.shutdown()
+
+def test_recorded_feeds_parse_like_feedparser():
+    srv = fixture_server.start()
+    try:
+        for name in ("rec-rss2", "rec-atom", "rec-rdf", "rec-malformed"):
+            url = "http://%s:%d/feed/%s.xml" % (srv.server_address + (name,))
+            feed = aio.run(feeds._fetch_feed(url))
+            with open(os.path.join(fixture_server.FIXTURES_DIR, name + ".xml"), "rb") as f:
+                expected = feedparser.parse(f.read())
+            assert [e.title for e in feed.entries] == [e.title for e in expected.entries], name
+            assert all(e.get("published_parsed") or e.get("updated_parsed") for e in feed.entries), name
+            assert (metrics.FEED_PARSE_FALLBACK.values.get((url,), 0) > 0) == (name == "rec-malformed")
+    finally:
+        srv.shutdown()
+
+def test_unparseable_body_counts_as_a_breaker_failure():
+    srv = fixture_server.start()
+    try:
+        url = "http://%s:%d/article/alpha/1.html" % srv.server_address  # HTML, not a feed
+        assert aio.run(feeds._fetch_feed(url)) is None
+        assert feeds._BREAKER[url]["fails"] == 1 and url not in feeds._VALIDATORS
+    finally:
+        feeds._BREAKER.pop(url, None)
+        srv.shutdown()
+
+def test_half_open_breaker_lets_one_probe_through():
+    url = "http://breaker.invalid/feed.xml"
+    for _ in range(feeds.BREAKER_THRESHOLD):
+        feeds._breaker_record(url, False, 0.1)
+    try:
+        assert not feeds._breaker_allows(url)  # open
+        feeds._BREAKER[url]["open_until"] = 0.0  # cool-off over
+        assert feeds._breaker_allows(url)       # the probe
+        assert not feeds._breaker_allows(url)   # everyone else waits for it
+        feeds._breaker_record(url, False, 0.1)  # probe failed: open again
+        assert not feeds._breaker_allows(url)
+        feeds._BREAKER[url]["open_until"] = 0.0
+        assert feeds._breaker_allows(url)
+        feeds._breaker_record(url, True, 0.1)   # probe succeeded: closed
+        assert feeds._breaker_allows(url) and feeds._breaker_allows(url)
+    finally:
+        feeds._BREAKER.pop(url, None)
@@ -0,0 +1,33 @@
+import datetime as dt, random
+
+from backend.aggregator import index
+from backend.aggregator.utils import now_ist, within_days_ist
+
+WORDS = ["metro", "metropolitan", "rail", "budget", "rbi", "repo", "rate", "farmers", "flood", "relief", "isro"]
+
+def _records(n: int, seed: int = 7):
+    rng, now, recs = random.Random(seed), now_ist(), []
+    ages = rng.sample(range(20 * 24 * 60), n)  # distinct minutes, so newest-first is one order
+    for i in range(n):
+        pub = now - dt.timedelta(minutes=ages[i]) if i % 17 else None
+        title = " ".join(rng.choice(WORDS) for _ in range(6))
+        recs.append({"item": {"title": title, "url": f"https://x.in/{seed}/{i}", "summary": "", "source": "src",
+                              "published_at": pub.isoformat() if pub else None}, "pub": pub})
+    recs.sort(key=lambda r: r["item"]["published_at"] or "", reverse=True)
+    return recs
+
+def _brute(recs, queries, days, limit):
+    hits = [r["item"] for r in recs if within_days_ist(r["pub"], days)
+            and any(index.tokenize(q) and q.lower() in r["item"]["title"] + " " for q in queries)]
+    return [it["url"] for it in hits][:limit]
+
+def test_search_matches_a_full_scan():
+    recs = _records(600)
+    idx = index.InvertedIndex()
+    idx.sync(recs)
+    recs = sorted(recs[50:] + _records(20, seed=8), key=lambda r: r["item"]["published_at"] or "", reverse=True)
+    idx.sync(recs)  # a refresh: items drop out, new ones arrive
+    for queries in (["metro"], ["metro rail"], ["rbi", "isro"], ["flood rel"], ["nothing"], ["metr", "rate"]):
+        for days, limit in ((2, 10), (7, 80), (14, None)):
+            got = [it["url"] for it in idx.search(queries, days, limit)]
+            assert got == _brute(recs, queries, days, limit), (queries, days, limit)
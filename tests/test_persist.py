@@ -0,0 +1,41 @@
+import datetime as dt, os, pickle, stat, zlib
+
+import pytest
+
+from backend.aggregator import persist
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(persist, "PERSIST_ENABLED", True)
+    monkeypatch.setattr(persist, "SHARED_STORE", True)
+    monkeypatch.setattr(persist, "PERSIST_PATH", str(tmp_path / "app" / "store.sqlite3"))
+    monkeypatch.setattr(persist, "_CONN", None)
+    yield persist.PERSIST_PATH
+    if persist._CONN is not None:
+        persist._CONN.close()
+
+def _record(pub):
+    return {"item": {"title": "Metro line opens", "url": "https://example.com/a", "categories": ["politics"],
+                     "published_at": pub.isoformat() if pub else None, "state": None},
+            "pub": pub, "title": "Metro line opens", "desc": "d", "text": "d", "cats": {"politics": 2}, "stance": None}
+
+def test_snapshot_round_trips_as_json(db):
+    pub = dt.datetime(2026, 10, 17, 6, 30, tzinfo=dt.timezone.utc)
+    records = [_record(pub), _record(None)]
+    ts = persist.put_snapshot("national", records)
+    assert persist.get_snapshot("national") == (ts, records)
+    assert persist.get_snapshot("national", newer_than=ts) is None
+
+def test_database_is_private(db):
+    assert persist._conn() is not None
+    assert stat.S_IMODE(os.stat(db).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(db)).st_mode) == 0o700
+
+class _Boom:
+    def __reduce__(self):
+        return (os._exit, (99,))
+
+def test_pickled_snapshot_is_never_unpickled(db):
+    blob = zlib.compress(pickle.dumps([_Boom()]))
+    persist._exec("INSERT OR REPLACE INTO snapshots (key, records, ts) VALUES (?, ?, ?)", ("national", blob, 1e12))
+    assert persist.get_snapshot("national") is None
@@ -0,0 +1,72 @@
+import datetime as dt, time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend import respcache
+from backend.aggregator import store
+from backend.app import app
+
+def _client(skey: str, build) -> TestClient:
+    a = FastAPI()
+
+    @a.get("/x")
+    def x(request: Request):
+        return respcache.respond(request, skey, build)
+    return TestClient(a)
+
+def test_cached_hits_keep_the_store_key_active_and_revalidate_it(monkeypatch):
+    key = store.store_key("national")
+    client = TestClient(app)
+    calls = []
+    monkeypatch.setattr(store, "_refresh_in_background", calls.append)
+    store._install(key, [], time.time())
+    assert client.get("/api/signals/top5").status_code == 200
+    store._LAST_ACCESS.pop(key, None)
+    assert client.get("/api/signals/top5").status_code == 200  # served from the response cache
+    assert key in store._LAST_ACCESS and not calls
+    store._STORE[key]["ts"] -= dt.timedelta(seconds=store._STORE_TTL_SECONDS + 1)
+    assert client.get("/api/signals/top5").status_code == 200
+    assert calls == [key]
+    store._STORE.pop(key, None)
+
+def test_each_encoding_has_its_own_etag():
+    respcache._ENTRIES.clear()
+    client = _client("none|", lambda: {"items": ["story"] * 200})
+    plain = client.get("/x", headers={"Accept-Encoding": "identity"})
+    gz = client.get("/x", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers and gz.headers["content-encoding"] == "gzip"
+    assert plain.headers["etag"] != gz.headers["etag"] and plain.json() == gz.json()
+    assert client.get("/x", headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}).status_code == 304
+    assert client.get("/x", headers={"Accept-Encoding": "identity", "If-None-Match": gz.headers["etag"]}).status_code == 200
+    respcache._ENTRIES.clear()
+
+def test_accept_encoding_q_values_and_wildcard():
+    e = respcache._build_entry(b"x" * 1000, "application/json")
+    e["br"] = b"br-bytes"  # as if brotli were installed
+    def coding(header):
+        return respcache._negotiate(type("R", (), {"headers": {"accept-encoding": header}})(), e)
+    assert coding("") == "identity"
+    assert coding("gzip, br") == "br"
+    assert coding("GZIP;q=0.9, br;q=0.5") == "gzip"
+    assert coding("br;q=0, *") == "gzip"
+    assert coding("*;q=0, gzip;q=0.5") == "gzip"
+    assert coding("gzip;q=0, br;q=0.0") == "identity"
+    assert coding("identity, gzip;q=0.5") == "identity"
+    assert coding("x-gzip") == "gzip"
+    assert coding("gzip;q=abc") == "identity"
+
+def test_a_build_that_loads_the_store_is_cached_under_the_loaded_version():
+    key = "respcache-test|"
+    store.register(key, lambda: [])
+    builds = []
+    client = _client(key, lambda: builds.append(1) or {"items": store.get_records(key)})
+    try:
+        assert client.get("/x").status_code == 200  # cold: the build itself loads version 1
+        assert client.get("/x").status_code == 200
+        assert store.version(key) == 1 and len(builds) == 1
+    finally:
+        store._LOADERS.pop(key, None)
+        store._STORE.pop(key, None)
+        store._LAST_ACCESS.pop(key, None)
+        respcache._ENTRIES.clear()
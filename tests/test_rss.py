@@ -0,0 +1,78 @@
+import datetime as dt
+
+import feedparser
+import pytest
+
+from backend.aggregator import rss
+from bench import fixture_server
+
+FIELDS = ("title", "link", "summary", "published_parsed", "updated_parsed")
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Atom &amp; co</title>
+<entry><title>One</title><link rel="self" href="http://a/self"/><link href="http://a/1"/><id>tag:a,1</id>
+<updated>2026-10-16T10:00:00Z</updated><published>2026-10-16T09:00:00+05:30</published><summary>Sum &amp; one</summary></entry>
+<entry><title>Two&#8217;s</title><link rel="alternate" href="/rel/2"/><updated>2026-10-15T10:00:00Z</updated>
+<content type="html">&lt;p&gt;Body&lt;/p&gt;</content></entry></feed>"""
+
+RDF = b"""<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+ xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="x"><title>arXiv cs.CV</title><link>http://arxiv.org/</link></channel>
+<item rdf:about="http://arxiv.org/abs/1"><title>Paper one</title><link>http://arxiv.org/abs/1</link>
+<description>Abs&nbsp;one</description><dc:date>2026-10-16T00:00:00Z</dc:date></item>
+<item rdf:about="http://arxiv.org/abs/2"><title>Paper two</title><link>http://arxiv.org/abs/2</link><description>Abs two</description></item>
+</rdf:RDF>"""
+
+def _same_as_feedparser(body: bytes):
+    ours, theirs = rss.parse(body), feedparser.parse(body)
+    assert ours.feed.get("title") == theirs.feed.get("title")
+    assert len(ours.entries) == len(theirs.entries)
+    for a, b in zip(ours.entries, theirs.entries):
+        assert {f: dict.get(a, f) for f in FIELDS} == {f: dict.get(b, f) for f in FIELDS}  # no alias fallbacks
+    return ours
+
+def test_rss2_matches_feedparser():
+    assert len(_same_as_feedparser(fixture_server.make_rss("x", 60, 6)).entries) == 60
+
+def test_atom_matches_feedparser():
+    parsed = _same_as_feedparser(ATOM)
+    assert parsed.entries[0].link == "http://a/1"  # rel=alternate, not rel=self
+
+def test_atom_relative_links_resolve_against_feed_url():
+    assert rss.parse(ATOM, "http://base/x").entries[1].link == "http://base/rel/2"
+
+def test_rdf_matches_feedparser():
+    parsed = _same_as_feedparser(RDF)
+    assert parsed.entries[0].description == "Abs\xa0one"  # HTML entity in a DTD-less feed
+
+def test_malformed_mid_document_falls_back_instead_of_dropping_entries():
+    items = "".join(f"<item><title>t{i}{' & co' if i == 2 else ''}</title><link>http://x/{i}</link></item>"
+                    for i in range(8))
+    body = f'<rss version="2.0"><channel><title>T</title>{items}</channel></rss>'.encode()
+    with pytest.raises(rss.Unsupported):
+        rss.parse(body)
+    assert len(feedparser.parse(body).entries) == 8  # what the caller falls back to
+
+def test_truncated_body_keeps_entries_read_so_far():
+    body = fixture_server.make_rss("big", 400, 6)
+    parsed = rss.parse(body[:len(body) // 2])
+    assert parsed.bozo == 1
+    assert 150 < len(parsed.entries) < 400
+
+def test_iter_entries_yields_completed_entries_before_an_error():
+    items = "".join(f"<item><title>t{i}</title></item>" for i in range(3))
+    got = []
+    with pytest.raises(Exception):
+        for e in rss.iter_entries([f"<rss><channel>{items}<item><title>a & b".encode()]):
+            got.append(e.title)
+    assert got == ["t0", "t1", "t2"]
+
+def test_stops_at_entry_cap_and_date_cutoff():
+    body = fixture_server.make_rss("big", 400, 6)  # one item every 37 minutes
+    assert len(rss.parse(body, max_entries=50).entries) == 50
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=2)
+    assert 75 <= len(rss.parse(body, cutoff=cutoff).entries) <= 79
+
+def test_not_a_feed_is_unsupported():
+    for body in (b"<html><body>503</body></html>", b"not xml", b""):
+        with pytest.raises(rss.Unsupported):
+            rss.parse(body)
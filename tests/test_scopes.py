@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from backend.aggregator import fetch, sources, store
+from backend.app import app
+
+def test_unknown_state_is_rejected_without_creating_store_keys():
+    registered, accessed = set(store._LOADERS), set(store._LAST_ACCESS)
+    client = TestClient(app)
+    for i in range(5):
+        assert client.get(f"/api/news?scope=state&state=junk{i}").status_code == 400
+        assert client.get(f"/api/news/stream?scope=state&state=junk{i}").status_code == 400
+    assert fetch.get_news("state", "junk", None, 2, 10) == []
+    assert list(fetch.stream_news("state", "junk", None, 2, 10)) == [{"event": "done", "count": 0, "order": []}]
+    assert store.get_records(store.store_key("state", "junk")) == []
+    assert set(store._LOADERS) == registered
+    assert set(store._LAST_ACCESS) == accessed
+
+def test_state_without_feeds_is_empty_not_an_error():
+    registered, accessed = set(store._LOADERS), set(store._LAST_ACCESS)
+    assert "Goa" in sources.STATES and "Goa" not in sources.STATE_FEEDS
+    client = TestClient(app)
+    r = client.get("/api/news?scope=state&state=Goa")
+    assert r.status_code == 200 and r.json() == {"items": []}
+    r = client.get("/api/news/stream?scope=state&state=Goa")
+    assert r.status_code == 200 and r.text.strip().splitlines()[-1].startswith('{"event": "done", "count": 0')
+    assert client.get("/api/news?scope=state").status_code == 400  # state missing
+    assert set(store._LOADERS) == registered
+    assert set(store._LAST_ACCESS) == accessed
+
+def test_configured_states_are_registered():
+    for state in sources.STATE_FEEDS:
+        assert fetch.known_scope("state", state)
+        assert store.store_key("state", state) in store._LOADERS
+    assert fetch.known_scope("national", "anything")
+
+def test_metrics_carry_no_series_for_request_supplied_keys():
+    client = TestClient(app)
+    for i in range(3):
+        client.get(f"/api/news?scope=state&state=junk{i}")
+    assert "junk" not in client.get("/metrics").text
+    store._install("state|junk", [], 0.0)  # even if something installs an unregistered key
+    store._STORE.pop("state|junk", None)
+    assert 'key="state|junk"' not in client.get("/metrics").text
@@ -0,0 +1,57 @@
+import json, time
+
+from fastapi.testclient import TestClient
+
+from backend.aggregator import fetch, sources, store
+from backend.app import app
+from bench import fixture_server
+
+def test_cold_stream_matches_news():
+    srv = fixture_server.start()
+    saved = list(sources.NATIONAL_FEEDS)
+    base = "http://%s:%d" % srv.server_address
+    sources.NATIONAL_FEEDS[:] = [f"{base}/feed/{n}.xml?items=40&delay={d}" for n, d in [("a", 0), ("b", 0.2)]]
+    try:
+        store._STORE.clear()
+        fetch._CACHE.clear()
+        client = TestClient(app)
+        r = client.get("/api/news/stream?limit=30")
+        assert "server-timing" not in r.headers
+        frames = [json.loads(line) for line in r.text.splitlines()]
+        done = frames[-1]
+        assert done["event"] == "done" and "total;dur=" in done["server_timing"]
+        fetch._CACHE.clear()  # /api/news computes its own result from the same store generation
+        news = client.get("/api/news?limit=30").json()["items"]
+        assert done["order"] == [it["url"] for it in news]
+        latest = {f["item"]["url"]: f["item"] for f in frames[:-1]}  # a later frame replaces an earlier one
+        assert [latest[u] for u in done["order"]] == news
+    finally:
+        sources.NATIONAL_FEEDS[:] = saved
+        store._STORE.clear()
+        fetch._CACHE.clear()
+        srv.shutdown()
+
+def test_cold_stream_sends_items_before_the_slow_feed_lands():
+    srv = fixture_server.start()
+    saved = list(sources.NATIONAL_FEEDS)
+    base = "http://%s:%d" % srv.server_address
+    sources.NATIONAL_FEEDS[:] = [f"{base}/feed/{n}.xml?items=40&delay={d}" for n, d in [("a", 0), ("b", 1.5)]]
+    try:
+        store._STORE.clear()
+        fetch._CACHE.clear()
+        t0 = time.perf_counter()
+        frames = fetch.stream_news("national", None, None, 2, 30)
+        first = next(frames)
+        assert first["event"] == "item" and time.perf_counter() - t0 < 1.0
+        frames = [first] + list(frames)
+        assert time.perf_counter() - t0 >= 1.5
+        fetch._CACHE.clear()
+        news = fetch.get_news("national", None, None, 2, 30)
+        latest = {f["item"]["url"]: f["item"] for f in frames[:-1]}
+        assert frames[-1]["order"] == [it["url"] for it in news]
+        assert [latest[u] for u in frames[-1]["order"]] == news
+    finally:
+        sources.NATIONAL_FEEDS[:] = saved
+        store._STORE.clear()
+        fetch._CACHE.clear()
+        srv.shutdown()